@@ -0,0 +1,342 @@
+# Admission control: per-route and per-user concurrency limits with bounded
+# wait queues, deadline-aware load shedding and a per-user token bucket.
+# Slow sync handlers (bcrypt login, large list pages) run in Starlette's shared
+# threadpool; capping them here keeps threads free for cheap requests instead
+# of letting a burst queue up until everything times out.
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Hashable, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from . import metrics
+from .dependencies import ALGORITHM, SECRET_KEY
+
+
+@dataclass(frozen=True)
+class RouteLimit:
+    """
+    Concurrency cap for one route ('path' uses route syntax, e.g. /campaigns/{campaign_id}).
+    Requests over 'max_concurrent' wait in a queue of at most 'max_queue' entries
+    for up to 'max_wait' seconds.
+    """
+    method: str
+    path: str
+    max_concurrent: int
+    max_queue: int
+    max_wait: float
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    """
+    Central admission configuration: route limits plus per-user limits.
+    A user may have 'user_max_concurrent' requests in progress and is refilled
+    'user_rate' requests per second, up to a burst of 'user_burst'.
+    GET requests on 'coalesced_paths' (route syntax) share the response of an
+    identical in-flight request (see coalescing.py): when one identical request
+    already holds the slots, up to 'user_max_coalesced' of the user's others
+    join it without taking any; beyond that they are admitted as usual.
+    """
+    routes: Tuple[RouteLimit, ...] = ()
+    coalesced_paths: Tuple[str, ...] = ()
+    user_max_coalesced: int = 32
+    user_max_concurrent: int = 8
+    user_max_queue: int = 8
+    user_max_wait: float = 2.0
+    user_rate: float = 50.0
+    user_burst: int = 200
+
+
+class Rejected(Exception):
+    """
+    Raised when a request is not admitted.
+    """
+
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter: 'rate' tokens per second, at most 'burst' stored.
+    """
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """
+        Take one token. Returns 0 on success, else the seconds until one is available.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class ConcurrencyLimiter:
+    """
+    Async semaphore with a bounded FIFO wait queue and a service time estimate.
+    Runs on the event loop only, so it needs no locking.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, max_wait: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.service_time = 0.0  # EWMA of seconds per request
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self) -> float:
+        """
+        Estimated queueing time for a request arriving now.
+        """
+        return (self.waiting + 1) / self.max_concurrent * self.service_time
+
+    async def acquire(self, deadline: float) -> None:
+        """
+        Take a slot, waiting until 'deadline' (monotonic) at the latest.
+        Raises Rejected if the queue is full, if the estimated wait already
+        exceeds the deadline, or if the deadline passes while waiting.
+        """
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            return
+
+        expected = self.expected_wait()
+        if self.waiting >= self.max_queue:
+            raise Rejected(503, "queue_full", expected)
+        remaining = deadline - time.monotonic()
+        if expected > remaining:
+            raise Rejected(503, "deadline", expected)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # On success the releasing request hands its slot over: 'active' is unchanged.
+            await asyncio.wait_for(waiter, remaining)
+        except BaseException as error:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up (timeout or disconnect).
+                self.release()
+            if isinstance(error, asyncio.TimeoutError):
+                raise Rejected(503, "deadline", self.expected_wait())
+            raise
+
+    def release(self, elapsed: Optional[float] = None) -> None:
+        """
+        Free a slot (or hand it to the next waiter) and record the service time, if given.
+        """
+        if elapsed is not None:
+            self.service_time = elapsed if not self.service_time else 0.8 * self.service_time + 0.2 * elapsed
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionController:
+    """
+    Holds the limiter state for an AdmissionPolicy.
+    """
+
+    # Idle per-user state is dropped once this many users are tracked.
+    MAX_TRACKED_USERS = 10_000
+
+    def __init__(self, policy: AdmissionPolicy):
+        self.policy = policy
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Drop all limiter state (used by tests).
+        """
+        self.routes: List[Tuple[str, Pattern, str, ConcurrencyLimiter]] = [
+            (
+                limit.method.upper(),
+                compile_path(limit.path)[0],
+                f"{limit.method.upper()} {limit.path}",
+                ConcurrencyLimiter(limit.max_concurrent, limit.max_queue, limit.max_wait),
+            )
+            for limit in self.policy.routes
+        ]
+        self.user_buckets: Dict[str, TokenBucket] = {}
+        self.user_limiters: Dict[str, ConcurrencyLimiter] = {}
+        self.coalesced: List[Pattern] = [compile_path(path)[0] for path in self.policy.coalesced_paths]
+        self.in_flight: Dict[Hashable, int] = {}  # admitted coalesced reads, by coalescing key
+        self.followers: Dict[str, int] = {}  # requests per user let through behind an identical one
+
+    def match_route(self, method: str, path: str) -> Optional[Tuple[str, ConcurrencyLimiter]]:
+        for route_method, pattern, name, limiter in self.routes:
+            if route_method == method and pattern.match(path):
+                return name, limiter
+        return None
+
+    def coalescing_key(self, scope: Scope, user: str) -> Optional[Hashable]:
+        """
+        Key of identical requests (same user, path and query) on a coalesced GET route, else None.
+        """
+        if scope["method"] != "GET" or not any(pattern.match(scope["path"]) for pattern in self.coalesced):
+            return None
+        query = tuple(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)))
+        return user, scope["path"], query
+
+    def user_state(self, user: str) -> Tuple[TokenBucket, ConcurrencyLimiter]:
+        if user not in self.user_buckets:
+            if len(self.user_buckets) >= self.MAX_TRACKED_USERS:
+                self._prune_users()
+            policy = self.policy
+            self.user_buckets[user] = TokenBucket(policy.user_rate, policy.user_burst)
+            self.user_limiters[user] = ConcurrencyLimiter(
+                policy.user_max_concurrent, policy.user_max_queue, policy.user_max_wait
+            )
+        return self.user_buckets[user], self.user_limiters[user]
+
+    def _prune_users(self) -> None:
+        for user, limiter in list(self.user_limiters.items()):
+            if limiter.active == 0 and not limiter.waiting:
+                del self.user_limiters[user]
+                del self.user_buckets[user]
+
+    def collect(self) -> Dict[str, float]:
+        """
+        Metrics collector: in-flight and queued requests per limited route.
+        """
+        values = {"admission.tracked_users": len(self.user_buckets)}
+        for _, _, name, limiter in self.routes:
+            values[f"admission.{name}.active"] = limiter.active
+            values[f"admission.{name}.waiting"] = limiter.waiting
+        return values
+
+
+def request_user(headers: Headers, scope: Scope) -> str:
+    """
+    Identify the caller: the subject of a valid bearer token, else the client address.
+    """
+    authorization = headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        try:
+            subject = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+            if subject:
+                return f"user:{subject}"
+        except JWTError:
+            pass
+    client = scope.get("client")
+    return f"addr:{client[0] if client else 'unknown'}"
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying an AdmissionController before routing.
+    Rate-limited users get 429, overloaded routes 503; both carry Retry-After.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        user = request_user(Headers(scope=scope), scope)
+        bucket, user_limiter = self.controller.user_state(user)
+        route = self.controller.match_route(scope["method"], scope["path"])
+        route_name = route[0] if route else "other"
+
+        wait = bucket.take()
+        if wait:
+            metrics.increment("admission.rate_limited")
+            await self._reject(scope, receive, send, Rejected(429, "rate_limited", wait))
+            return
+
+        in_flight = self.controller.in_flight
+        key = self.controller.coalescing_key(scope, user)
+        followers = self.controller.followers
+        if key in in_flight and followers.get(user, 0) < self.controller.policy.user_max_coalesced:
+            # An identical request holds the slots: this one most likely shares its
+            # response, so it takes none (and never queues behind it). It still runs
+            # its dependencies in the threadpool, and may run its own query if the
+            # shared one has just finished: hence the per-user cap.
+            metrics.increment(f"admission.{route_name}.coalesced")
+            followers[user] = followers.get(user, 0) + 1
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                followers[user] -= 1
+                if not followers[user]:
+                    del followers[user]
+            return
+
+        limiters = [user_limiter] + ([route[1]] if route else [])
+        # Each limiter waits at most its own max_wait, counted from arrival.
+        arrived = time.monotonic()
+        acquired: List[ConcurrencyLimiter] = []
+        try:
+            for limiter in limiters:
+                await limiter.acquire(arrived + limiter.max_wait)
+                acquired.append(limiter)
+        except Rejected as rejected:
+            if not acquired:
+                # The user's own concurrency limit, not the server, turned the request away.
+                rejected = Rejected(429, "user_concurrency", rejected.retry_after)
+            for held in acquired:
+                held.release()
+            metrics.increment(f"admission.{route_name}.rejected.{rejected.reason}")
+            await self._reject(scope, receive, send, rejected)
+            return
+
+        metrics.increment(f"admission.{route_name}.admitted")
+        if key is not None:
+            in_flight[key] = in_flight.get(key, 0) + 1
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.monotonic() - started
+            for limiter in reversed(acquired):
+                limiter.release(elapsed)
+            if key is not None:
+                in_flight[key] -= 1
+                if not in_flight[key]:
+                    del in_flight[key]
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, rejected: Rejected) -> None:
+        response = JSONResponse(
+            status_code=rejected.status_code,
+            content={"detail": "Too many requests, retry later"
+                     if rejected.status_code == 429 else "Server busy, retry later"},
+            headers={"Retry-After": str(max(1, math.ceil(rejected.retry_after)))},
+        )
+        await response(scope, receive, send)
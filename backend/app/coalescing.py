@@ -0,0 +1,89 @@
+# Single-flight request coalescing.
+# When identical read requests arrive at the same time (e.g. a dashboard open
+# on many screens), only the first one runs the query and serialization; the
+# others wait for it and share the same response bytes.
+#
+# The leader runs the (blocking) computation in the threadpool; followers wait
+# on an asyncio future in the event loop, so a burst of identical requests
+# takes one worker thread, not one per request.
+
+import asyncio
+from typing import Any, Callable, Dict, Hashable
+
+from starlette.concurrency import run_in_threadpool
+
+from . import metrics
+
+
+class _Call:
+    """
+    One in-flight computation and the callers waiting for it.
+    """
+    __slots__ = ("future", "waiters")
+
+    def __init__(self):
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time and share its result with
+    every caller that asked for the same key while it was running.
+    Nothing is cached: once the computation finishes, the next caller starts a new one.
+    Must be used from the event loop thread.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Return fn() (run in the threadpool), or the result of an identical in-flight call.
+        Exceptions raised by fn() are re-raised in every waiting caller.
+        """
+        while key in self._calls:
+            call = self._calls[key]
+            call.waiters += 1
+            metrics.increment(f"{self.name}.coalesced")
+            try:
+                # shield(): a follower going away must not cancel the leader's call.
+                return await asyncio.shield(call.future)
+            except asyncio.CancelledError:
+                if not call.future.cancelled():
+                    raise
+                # The leader's request was cancelled: run the computation again.
+
+        call = self._calls[key] = _Call()
+        metrics.increment(f"{self.name}.executed")
+        try:
+            result = await run_in_threadpool(fn)
+        except asyncio.CancelledError:
+            call.future.cancel()
+            raise
+        except BaseException as error:
+            call.future.set_exception(error)
+            call.future.exception()  # retrieved: no "never retrieved" warning without followers
+            raise
+        else:
+            call.future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def waiters(self, key: Hashable) -> int:
+        """
+        Number of callers currently waiting on the in-flight call for 'key'.
+        """
+        call = self._calls.get(key)
+        return call.waiters if call else 0
+
+    def collect(self) -> Dict[str, float]:
+        """
+        Metrics collector: share of requests served by another request's computation.
+        """
+        executed = metrics.value(f"{self.name}.executed")
+        coalesced = metrics.value(f"{self.name}.coalesced")
+        total = executed + coalesced
+        return {f"{self.name}.coalesce_ratio": coalesced / total if total else 0.0}
@@ -1,5 +1,12 @@
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, func, insert, literal, select, text, union_all, update
 from sqlalchemy.orm import Session
-from . import models, schemas
+from . import models, schemas, statements
+from .readmodels import CAMPAIGN_ROW_COLUMNS, CampaignRow, to_campaign_rows
+from .sharding import CAMPAIGN_IDS
 from .dependencies import get_password_hash # Import hashing function
 
 # --- User CRUD ---
@@ -8,7 +15,7 @@ def get_user_by_username(db: Session, username: str):
     """
     Fetch a single user from the database by their username.
     """
-    return db.query(models.User).filter(models.User.username == username).first()
+    return db.execute(statements.USER_BY_USERNAME, {"username": username}).scalars().first()
 
 def create_user(db: Session, user: schemas.UserCreate):
     """
@@ -24,23 +31,150 @@ def create_user(db: Session, user: schemas.UserCreate):
 
 # --- Campaign CRUD ---
 
-def get_campaign(db: Session, campaign_id: int):
+def get_campaign(db: Session, owner_id: int, campaign_id: int, include_archived: bool = False):
+    """
+    Fetch a single campaign of 'owner_id' from the database by its ID.
+    With 'include_archived', fall back to the archive if it is not a live campaign.
+    """
+    campaign = db.execute(
+        statements.CAMPAIGN_BY_ID, {"campaign_id": campaign_id, "owner_id": owner_id}
+    ).scalars().first()
+    if campaign is None and include_archived:
+        campaign = db.get(models.ArchivedCampaign, campaign_id)
+        if campaign is not None and campaign.owner_id != owner_id:
+            campaign = None
+    return campaign
+
+def get_campaigns(
+        db: Session,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        ids: Optional[List[int]] = None,
+        fields: Optional[List[str]] = None,
+        include_archived: bool = False,
+):
+    """
+    Fetch a list of campaigns of 'owner_id' from the database with pagination.
+    Returns read-only CampaignRow objects, not ORM instances.
+    If 'ids' is given, fetch exactly those campaigns in one IN (...) query
+    (no pagination). If 'fields' is given, only those columns are selected
+    and rows come back as dicts.
+    With 'include_archived', archived campaigns are included (ordered by id, as dicts).
+    """
+    if include_archived:
+        return _get_campaigns_with_archive(
+            db, owner_id, skip, limit, ids, fields or list(schemas.Campaign.model_fields)
+        )
+
+    if not fields:
+        if ids is not None:
+            return to_campaign_rows(db.execute(statements.CAMPAIGNS_BY_IDS, {"owner_id": owner_id, "ids": ids}))
+        return to_campaign_rows(db.execute(
+            statements.CAMPAIGNS_PAGE, {"owner_id": owner_id, "skip": skip, "limit": limit}
+        ))
+
+    # Ordered by id like the full rows, so pages match whatever the fields.
+    query = (
+        db.query(*(getattr(models.Campaign, field) for field in fields))
+        .filter(models.Campaign.owner_id == owner_id)
+        .order_by(models.Campaign.id)
+    )
+    if ids is not None:
+        query = query.filter(models.Campaign.id.in_(ids))
+    else:
+        query = query.offset(skip).limit(limit)
+    return [row._asdict() for row in query]
+
+def _get_campaigns_with_archive(
+        db: Session, owner_id: int, skip: int, limit: int, ids: Optional[List[int]], fields: List[str]
+):
+    """
+    Fetch live and archived campaigns together, as dicts ordered by id.
+    """
+    selects = []
+    for table in (models.Campaign.__table__, models.ArchivedCampaign.__table__):
+        table_select = select(*(table.c[field] for field in fields)).where(table.c.owner_id == owner_id)
+        if ids is not None:
+            table_select = table_select.where(table.c.id.in_(ids))
+        selects.append(table_select)
+
+    combined = union_all(*selects).subquery()
+    query = select(combined).order_by(combined.c.id)
+    if ids is None:
+        query = query.offset(skip).limit(limit)
+    return [row._asdict() for row in db.execute(query)]
+
+# Column weights for bm25(): a match in the name ranks above one in the description.
+SEARCH_NAME_WEIGHT = 10.0
+SEARCH_DESCRIPTION_WEIGHT = 1.0
+
+def build_search_query(q: str) -> str:
     """
-    Fetch a single campaign from the database by its ID.
+    Turn free user input into a safe FTS5 MATCH expression.
+    Every word becomes a quoted prefix term ("summ" matches "summer"),
+    and all terms must match. Returns an empty string if there is nothing to search.
     """
-    return db.query(models.Campaign).filter(models.Campaign.id == campaign_id).first()
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", q))
 
-def get_campaigns(db: Session, skip: int = 0, limit: int = 100):
+def search_campaigns(db: Session, owner_id: int, q: str, skip: int = 0, limit: int = 100):
     """
-    Fetch a list of campaigns from the database with pagination.
+    Full-text search over the name and description of the campaigns of
+    'owner_id', best matches first. Returns read-only CampaignRow objects.
     """
-    return db.query(models.Campaign).offset(skip).limit(limit).all()
+    match = build_search_query(q)
+    if not match:
+        return []
 
-def create_campaign(db: Session, campaign: schemas.CampaignCreate):
+    columns = ", ".join(f"campaigns.{column.name}" for column in CAMPAIGN_ROW_COLUMNS)
+    statement = text(
+        f"SELECT {columns} FROM {models.CAMPAIGN_SEARCH_TABLE} "
+        f"JOIN campaigns ON campaigns.id = {models.CAMPAIGN_SEARCH_TABLE}.rowid "
+        f"WHERE {models.CAMPAIGN_SEARCH_TABLE} MATCH :match AND campaigns.owner_id = :owner_id "
+        f"ORDER BY bm25({models.CAMPAIGN_SEARCH_TABLE}, :name_weight, :description_weight) "
+        "LIMIT :limit OFFSET :skip"
+    ).columns(*CAMPAIGN_ROW_COLUMNS)
+    return to_campaign_rows(db.execute(statement, {
+        "match": match,
+        "owner_id": owner_id,
+        "name_weight": SEARCH_NAME_WEIGHT,
+        "description_weight": SEARCH_DESCRIPTION_WEIGHT,
+        "limit": limit,
+        "skip": skip,
+    }))
+
+def rebuild_campaign_search_index(db: Session):
     """
-    Create a new campaign in the database.
+    Create the search index and its triggers if missing, then rebuild it
+    from the 'campaigns' table. Used for databases created before the index existed.
     """
-    db_campaign = models.Campaign(**campaign.model_dump())
+    for statement in models.CAMPAIGN_SEARCH_DDL:
+        db.execute(text(statement))
+    db.execute(text(
+        f"INSERT INTO {models.CAMPAIGN_SEARCH_TABLE}({models.CAMPAIGN_SEARCH_TABLE}) VALUES ('rebuild')"
+    ))
+    db.commit()
+
+def optimize_campaign_search_index(db: Session):
+    """
+    Merge the search index segments. Worth running after bulk deletes (e.g. archival),
+    which otherwise leave the index full of delete markers that slow down queries.
+    """
+    db.execute(text(
+        f"INSERT INTO {models.CAMPAIGN_SEARCH_TABLE}({models.CAMPAIGN_SEARCH_TABLE}) VALUES ('optimize')"
+    ))
+    db.commit()
+
+def create_campaign(db: Session, owner_id: int, campaign: schemas.CampaignCreate):
+    """
+    Create a new campaign owned by 'owner_id' in the database.
+    """
+    db_campaign = models.Campaign(
+        **campaign.model_dump(),
+        id=next_campaign_id(db),
+        owner_id=owner_id,
+        updated_version=next_sync_version(db),
+    )
     db.add(db_campaign)
     db.commit()
     db.refresh(db_campaign)
@@ -56,6 +190,7 @@ def update_campaign(db: Session, db_campaign: models.Campaign, campaign_in: sche
     # Update model fields
     for key, value in update_data.items():
         setattr(db_campaign, key, value)
+    db_campaign.updated_version = next_sync_version(db)
 
     db.add(db_campaign)
     db.commit()
@@ -65,7 +200,207 @@ def update_campaign(db: Session, db_campaign: models.Campaign, campaign_in: sche
 def delete_campaign(db: Session, db_campaign: models.Campaign):
     """
     Delete a campaign from the database.
+    Leaves a tombstone so delta sync clients see the delete.
     """
+    db.add(models.CampaignTombstone(
+        campaign_id=db_campaign.id,
+        owner_id=db_campaign.owner_id,
+        deleted_version=next_sync_version(db),
+        deleted_at=datetime.now(timezone.utc),
+    ))
     db.delete(db_campaign)
     db.commit()
     return db_campaign
+
+# --- Campaign Delta Sync ---
+
+CAMPAIGN_SYNC = "campaigns"
+
+def next_sync_version(db: Session, count: int = 1) -> int:
+    """
+    Bump the campaign sync version by 'count' (one per written row) and return
+    the new value, inside the caller's transaction. The UPDATE takes SQLite's
+    write lock, so versions follow commit order.
+    """
+    version = db.execute(
+        update(models.SyncState)
+        .where(models.SyncState.name == CAMPAIGN_SYNC)
+        .values(version=models.SyncState.version + count)
+        .returning(models.SyncState.version)
+    ).scalar()
+    if version is None:
+        version = count
+        db.add(models.SyncState(name=CAMPAIGN_SYNC, version=version, horizon=0))
+        db.flush()
+    return version
+
+def next_campaign_id(db: Session) -> Optional[int]:
+    """
+    Take the next campaign id from the shard's id block (see sharding.SHARD_ID_BITS),
+    inside the caller's transaction. Returns None on a database without an id
+    block (the main database): the id is then assigned by AUTOINCREMENT.
+    """
+    return db.execute(
+        update(models.SyncState)
+        .where(models.SyncState.name == CAMPAIGN_IDS)
+        .values(version=models.SyncState.version + 1)
+        .returning(models.SyncState.version)
+    ).scalar()
+
+def get_sync_state(db: Session) -> models.SyncState:
+    """
+    Fetch the campaign sync state (version 0 if nothing was ever written).
+    """
+    state = db.get(models.SyncState, CAMPAIGN_SYNC)
+    return state or models.SyncState(name=CAMPAIGN_SYNC, version=0, horizon=0)
+
+def get_campaign_changes(db: Session, owner_id: int, since: int, limit: int = 1000):
+    """
+    Fetch campaigns of 'owner_id' written and deleted after version 'since', oldest first.
+    Changed campaigns are returned as readmodels.CampaignRow.
+    Both lookups walk an (owner, version) index, so the cost is
+    proportional to the number of changes, not to the size of the table.
+    Returns (changed, deleted_ids, version, has_more): 'version' is what the
+    client passes as 'since' next time.
+    """
+    # Read the version before the rows: a write committing in between is then
+    # returned twice at worst, never skipped.
+    version = get_sync_state(db).version
+
+    params = {"owner_id": owner_id, "since": since, "limit": limit + 1}
+    changed = db.execute(statements.CAMPAIGNS_CHANGED_SINCE, params).all()
+    tombstones = db.execute(statements.CAMPAIGNS_DELETED_SINCE, params).all()
+
+    # Merge both streams by version and cut the page at 'limit' changes.
+    # Every write has its own version, so the cut never splits a version.
+    events = sorted(
+        [(row[-1], CampaignRow(*row[:-1])) for row in changed]
+        + [(deleted_version, campaign_id) for deleted_version, campaign_id in tombstones],
+        key=lambda event: event[0],
+    )
+    has_more = len(events) > limit
+    if has_more:
+        events = events[:limit]
+        version = events[-1][0]
+
+    changed = [e for _, e in events if isinstance(e, CampaignRow)]
+    deleted = [e for _, e in events if not isinstance(e, CampaignRow)]
+    return changed, deleted, version, has_more
+
+def compact_campaign_tombstones(db: Session, older_than: timedelta) -> int:
+    """
+    Delete tombstones older than 'older_than' and raise the sync horizon.
+    Clients whose last version is below the horizon must resync from 0.
+    Returns the number of tombstones removed.
+    """
+    cutoff = datetime.now(timezone.utc) - older_than
+    horizon = (
+        db.query(func.max(models.CampaignTombstone.deleted_version))
+        .filter(models.CampaignTombstone.deleted_at < cutoff)
+        .scalar()
+    )
+    if horizon is None:
+        return 0
+
+    removed = (
+        db.query(models.CampaignTombstone)
+        .filter(models.CampaignTombstone.deleted_version <= horizon)
+        .delete(synchronize_session=False)
+    )
+    state = db.get(models.SyncState, CAMPAIGN_SYNC)
+    state.horizon = max(state.horizon, horizon)
+    db.commit()
+    return removed
+
+# --- Campaign Archival ---
+
+def archive_finished_campaigns(db: Session, older_than: timedelta, batch_size: int = 500) -> int:
+    """
+    Move campaigns that ended more than 'older_than' ago to the archive table,
+    one transaction per batch so writers are never blocked for long.
+    Each archived campaign leaves a tombstone: for delta sync clients it has
+    left the live list. Returns the number of campaigns archived.
+    """
+    campaigns = models.Campaign.__table__
+    columns = [column.name for column in campaigns.c]
+    cutoff = date.today() - older_than
+    archived = 0
+
+    while True:
+        batch = db.execute(
+            select(campaigns.c.id, campaigns.c.owner_id).where(campaigns.c.end_date < cutoff).limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        ids = [campaign_id for campaign_id, _ in batch]
+
+        now = datetime.now(timezone.utc)
+        db.execute(
+            insert(models.ArchivedCampaign.__table__).from_select(
+                columns + ["archived_at"],
+                select(*campaigns.c, literal(now, models.ArchivedCampaign.archived_at.type))
+                .where(campaigns.c.id.in_(ids)),
+            )
+        )
+        first_version = next_sync_version(db, count=len(ids)) - len(ids) + 1
+        db.execute(insert(models.CampaignTombstone.__table__), [
+            {"campaign_id": campaign_id, "owner_id": owner_id, "deleted_version": first_version + i, "deleted_at": now}
+            for i, (campaign_id, owner_id) in enumerate(batch)
+        ])
+        db.execute(delete(campaigns).where(campaigns.c.id.in_(ids)))
+        db.commit()
+        archived += len(ids)
+
+    return archived
+
+# --- Shard Rebalancing ---
+
+OWNER_TABLES = (
+    models.Campaign.__table__,
+    models.ArchivedCampaign.__table__,
+    models.CampaignTombstone.__table__,
+)
+
+def copy_owner_campaigns(source: Session, target: Session, owner_id: int) -> int:
+    """
+    Copy the live and archived campaigns and the tombstones of 'owner_id' from
+    the 'source' shard to the 'target' shard, keeping their ids.
+    Everything copied gets a new sync version on the target, above any version
+    the owner's clients may have seen on the source, so their next delta sync
+    returns it all. Leftovers of an interrupted earlier copy are replaced.
+    Returns the number of campaigns (live and archived) copied.
+    """
+    rows = {
+        table: [dict(row) for row in source.execute(select(table).where(table.c.owner_id == owner_id)).mappings()]
+        for table in OWNER_TABLES
+    }
+    for table in OWNER_TABLES:
+        target.execute(delete(table).where(table.c.owner_id == owner_id))
+
+    count = sum(len(table_rows) for table_rows in rows.values())
+    if count:
+        gap = max(0, get_sync_state(source).version - get_sync_state(target).version)
+        version = next_sync_version(target, count=gap + count) - count
+        for table, table_rows in rows.items():
+            column = "deleted_version" if table is models.CampaignTombstone.__table__ else "updated_version"
+            for row in table_rows:
+                version += 1
+                row[column] = version
+            if table_rows:
+                target.execute(insert(table), table_rows)
+    target.commit()
+    return len(rows[models.Campaign.__table__]) + len(rows[models.ArchivedCampaign.__table__])
+
+def delete_owner_campaigns(db: Session, owner_id: int) -> int:
+    """
+    Remove everything of 'owner_id' from a shard once it was copied elsewhere.
+    No tombstones are left: the owner's clients now sync from the other shard.
+    Returns the number of campaigns (live and archived) removed.
+    """
+    removed = 0
+    for table in OWNER_TABLES:
+        result = db.execute(delete(table).where(table.c.owner_id == owner_id))
+        if table is not models.CampaignTombstone.__table__:
+            removed += result.rowcount
+    db.commit()
+    return removed
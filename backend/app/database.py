@@ -1,10 +1,14 @@
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # Define the database URL for SQLite.
 # The database file will be named 'opti-campaign.db' in the root directory.
-DATABASE_URL = "sqlite:///./opti-campaign.db"
+# It can be overridden with the DATABASE_URL environment variable (e.g. to
+# point the load-test harness at a generated dataset).
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./opti-campaign.db")
 
 # Create the SQLAlchemy engine.
 # connect_args is needed only for SQLite to allow multithreading.
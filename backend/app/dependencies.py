@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from . import crud, models, schemas
 from .database import SessionLocal
+from .sharding import ShardRouter, get_shard_router
 
 # --- Configuration ---
 # WARNING: In a real app, load this from environment variables!
@@ -78,3 +79,19 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     if user is None:
         raise credentials_exception
     return user
+
+def get_campaign_db(
+        current_user: models.User = Depends(get_current_user),
+        db: Session = Depends(get_db),
+        shard_router: ShardRouter = Depends(get_shard_router),
+):
+    """
+    FastAPI dependency to get a session on the shard holding the current user's campaigns.
+    Without sharding, this is the request's main database session.
+    """
+    campaign_db = shard_router.session(current_user.id, db)
+    try:
+        yield campaign_db
+    finally:
+        if campaign_db is not db:
+            campaign_db.close()
@@ -0,0 +1,176 @@
+# Columnar export of the campaigns table (Arrow IPC stream or Parquet).
+# Rows are read in keyset-paginated batches of plain tuples (no ORM objects,
+# no per-value date/bool conversion in Python) and converted to Arrow record
+# batches column by column, so memory stays bounded by one batch.
+
+from typing import Iterator, List, Optional
+
+from sqlalchemy import Integer, String, select, type_coerce
+from sqlalchemy.orm import Session
+
+from . import models
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional: exports are unavailable without it
+    pa = None
+
+EXPORT_FORMATS = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def is_available() -> bool:
+    """
+    Whether pyarrow is installed.
+    """
+    return pa is not None
+
+
+def campaign_schema() -> "pa.Schema":
+    return pa.schema([
+        ("id", pa.int64()),
+        ("name", pa.string()),
+        ("description", pa.string()),
+        ("start_date", pa.date32()),
+        ("end_date", pa.date32()),
+        ("budget", pa.float64()),
+        ("status", pa.bool_()),
+    ])
+
+
+def _batch_select(table, after_id: int, batch_size: int, owner_id: Optional[int]):
+    """
+    Next batch of raw rows after 'after_id'. Dates and booleans are read as
+    stored (ISO strings, 0/1) and converted by Arrow, a whole column at a time.
+    """
+    query = (
+        select(
+            table.c.id,
+            table.c.name,
+            table.c.description,
+            type_coerce(table.c.start_date, String),
+            type_coerce(table.c.end_date, String),
+            table.c.budget,
+            type_coerce(table.c.status, Integer),
+        )
+        .where(table.c.id > after_id)
+        .order_by(table.c.id)
+        .limit(batch_size)
+    )
+    if owner_id is not None:
+        query = query.where(table.c.owner_id == owner_id)
+    return query
+
+
+def _to_record_batch(rows: List[tuple], schema: "pa.Schema") -> "pa.RecordBatch":
+    ids, names, descriptions, start_dates, end_dates, budgets, statuses = zip(*rows)
+    return pa.record_batch([
+        pa.array(ids, pa.int64()),
+        pa.array(names, pa.string()),
+        pa.array(descriptions, pa.string()),
+        pc.cast(pa.array(start_dates, pa.string()), pa.date32()),
+        pc.cast(pa.array(end_dates, pa.string()), pa.date32()),
+        pa.array(budgets, pa.float64()),
+        pc.cast(pa.array(statuses, pa.int8()), pa.bool_()),
+    ], schema=schema)
+
+
+def iter_campaign_batches(
+        db: Session,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        include_archived: bool = False,
+        owner_id: Optional[int] = None,
+) -> Iterator["pa.RecordBatch"]:
+    """
+    Yield the campaigns (of 'owner_id', or all of them) as Arrow record batches
+    of at most 'batch_size' rows, ordered by id (live campaigns first, then the
+    archive if requested).
+    """
+    schema = campaign_schema()
+    tables = [models.Campaign.__table__]
+    if include_archived:
+        tables.append(models.ArchivedCampaign.__table__)
+
+    for table in tables:
+        after_id = 0
+        while True:
+            rows = db.execute(_batch_select(table, after_id, batch_size, owner_id)).all()
+            if not rows:
+                break
+            yield _to_record_batch(rows, schema)
+            after_id = rows[-1][0]
+
+
+class _ChunkSink:
+    """
+    Write-only file object collecting what pyarrow writes, drained between batches.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _open_writer(export_format: str, sink, schema: "pa.Schema"):
+    if export_format == "parquet":
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    return pa.ipc.new_stream(sink, schema)
+
+
+def stream_export(batches: Iterator["pa.RecordBatch"], export_format: str) -> Iterator[bytes]:
+    """
+    Encode record batches as an Arrow IPC stream or a Parquet file (one row
+    group per batch), yielding the bytes as each batch is written.
+    """
+    sink = _ChunkSink()
+    writer = _open_writer(export_format, sink, campaign_schema())
+    for batch in batches:
+        writer.write_batch(batch)
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    writer.close()
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+def write_export(batches: Iterator["pa.RecordBatch"], export_format: str, path: str) -> int:
+    """
+    Write record batches to a file at 'path'. Returns the number of rows written.
+    """
+    rows = 0
+    with pa.OSFile(path, "wb") as sink:
+        writer = _open_writer(export_format, sink, campaign_schema())
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+        writer.close()
+    return rows
@@ -6,8 +6,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Use relative imports (.) for sibling modules and packages
-from . import models, database
+from . import models, database, metrics
 from .routers import auth, campaigns
+from .admission import AdmissionController, AdmissionMiddleware, AdmissionPolicy, RouteLimit
+from .compression import CompressionMiddleware
 
 # --- Database Initialization ---
 # This command tells SQLAlchemy to create all tables based on the models
@@ -25,6 +27,35 @@ app = FastAPI(
     redoc_url="/redoc" # URL for ReDoc
 )
 
+# --- Admission Control ---
+# Central limits for the expensive routes, plus per-user concurrency and rate
+# limits. Over the limit, requests wait in a bounded queue; if the queue is full
+# or the wait would exceed the route's max_wait, they are rejected early with
+# 503 (429 for per-user limits) and a Retry-After header.
+# Added before CORS so that rejections still carry CORS headers.
+ADMISSION_POLICY = AdmissionPolicy(
+    routes=(
+        # bcrypt makes every login cost tens of milliseconds of CPU
+        RouteLimit("POST", "/auth/token", max_concurrent=4, max_queue=16, max_wait=2.0),
+        RouteLimit("GET", "/campaigns/", max_concurrent=8, max_queue=32, max_wait=2.0),
+        RouteLimit("GET", "/campaigns/search", max_concurrent=4, max_queue=16, max_wait=1.0),
+        RouteLimit("GET", "/campaigns/changes", max_concurrent=4, max_queue=16, max_wait=2.0),
+        # exports read the whole table
+        RouteLimit("GET", "/campaigns/export", max_concurrent=2, max_queue=4, max_wait=5.0),
+    ),
+    # Identical reads share one query and one response (see routers/campaigns.py),
+    # so a dashboard's burst of them costs a single slot.
+    coalesced_paths=("/campaigns/", "/campaigns/search", "/campaigns/changes", "/campaigns/{campaign_id:int}"),
+    # Followers still run their dependencies in the threadpool: cap them per user.
+    user_max_coalesced=32,
+    user_max_concurrent=8,
+    user_rate=50.0,
+    user_burst=200,
+)
+admission = AdmissionController(ADMISSION_POLICY)
+metrics.register_collector(admission.collect)
+app.add_middleware(AdmissionMiddleware, controller=admission)
+
 # --- CORS Middleware ---
 # Configure Cross-Origin Resource Sharing (CORS)
 # This allows the frontend (running on a different domain)
@@ -40,6 +71,16 @@ app.add_middleware(
     allow_headers=["*"], # Allows all headers
 )
 
+# --- Compression Middleware ---
+# Compress responses of 1 KB or more with brotli or gzip, as negotiated by
+# Accept-Encoding. Compressed campaign payloads are cached, so a repeated
+# identical response is not compressed again.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=1024,
+    cacheable_paths=["/campaigns"],
+)
+
 # --- Include Routers ---
 # Mount the routers from the routers module
 # The auth router handles the /token endpoint
@@ -55,3 +96,10 @@ async def read_root():
     """
     return {"message": "Welcome to the Opti-Campaign API!"}
 
+# --- Metrics Endpoint ---
+@app.get("/metrics", tags=["Root"])
+def read_metrics():
+    """
+    Export in-process metrics (counters and ratios) as JSON.
+    """
+    return metrics.snapshot()
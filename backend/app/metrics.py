@@ -0,0 +1,52 @@
+# In-process metrics registry, exported as JSON by GET /metrics.
+# Counters are incremented from request threads, so every update takes a lock.
+
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = defaultdict(float)
+_collectors: List[Callable[[], Dict[str, float]]] = []
+
+
+def increment(name: str, value: float = 1) -> None:
+    """
+    Add 'value' to the counter 'name'.
+    """
+    with _lock:
+        _counters[name] += value
+
+
+def value(name: str) -> float:
+    """
+    Return the current value of the counter 'name' (0 if never incremented).
+    """
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def register_collector(collector: Callable[[], Dict[str, float]]) -> None:
+    """
+    Register a function computing derived values (ratios, gauges) at export time.
+    """
+    _collectors.append(collector)
+
+
+def snapshot() -> Dict[str, float]:
+    """
+    Return the current value of every counter and collected metric.
+    """
+    with _lock:
+        values = dict(_counters)
+    for collector in _collectors:
+        values.update(collector())
+    return dict(sorted(values.items()))
+
+
+def reset() -> None:
+    """
+    Reset all counters (used by tests).
+    """
+    with _lock:
+        _counters.clear()
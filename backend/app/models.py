@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Float, Integer, String, Date
+from sqlalchemy import Boolean, Column, DDL, DateTime, Float, Index, Integer, String, Date, event
 from .database import Base
 
 class User(Base):
@@ -17,11 +17,114 @@ class Campaign(Base):
     Represents an advertising campaign.
     """
     __tablename__ = "campaigns"
+    # AUTOINCREMENT: ids of deleted campaigns are never reused, so a tombstone
+    # always refers to exactly one campaign.
+    __table_args__ = (
+        Index("ix_campaigns_owner_id_updated_version", "owner_id", "updated_version"),
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
+    # The user who owns the campaign; every read and write is scoped to it.
+    # No foreign key: with file shards (see sharding.py) users live in another database.
+    owner_id = Column(Integer, nullable=False, index=True)
     name = Column(String, index=True, nullable=False)
     description = Column(String, nullable=True)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     budget = Column(Float, nullable=False)
     status = Column(Boolean, default=True) # True=Active, False=Inactive
+    updated_version = Column(Integer, nullable=False, default=0, server_default="0") # Sync version of the last write
+
+class ArchivedCampaign(Base):
+    """
+    Finished campaign moved out of the 'campaigns' table by the archival job.
+    Keeps the id it had in 'campaigns' (never reused, see Campaign.__table_args__).
+    """
+    __tablename__ = "campaigns_archive"
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, nullable=False, index=True)
+    name = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    budget = Column(Float, nullable=False)
+    status = Column(Boolean, default=True)
+    updated_version = Column(Integer, nullable=False, default=0, server_default="0")
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+class CampaignTombstone(Base):
+    """
+    Record of a deleted campaign, so delta sync clients can learn about deletes.
+    """
+    __tablename__ = "campaign_tombstones"
+    __table_args__ = (
+        Index("ix_campaign_tombstones_owner_id_deleted_version", "owner_id", "deleted_version"),
+    )
+
+    campaign_id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, nullable=False)
+    deleted_version = Column(Integer, nullable=False, index=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False)
+
+class SyncState(Base):
+    """
+    Monotonic change counter for a synced collection.
+    'version' is bumped by every write; 'horizon' is the highest version whose
+    tombstones were compacted away (older 'since' values need a full resync).
+    On a campaign shard, the 'campaign_ids' row also holds the last id handed out.
+    """
+    __tablename__ = "sync_state"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    horizon = Column(Integer, nullable=False, default=0)
+
+
+# --- Full-Text Search Index ---
+# SQLite FTS5 virtual table indexing the campaign name and description.
+# It is an "external content" table: the text lives in 'campaigns' only and the
+# index is kept in sync by triggers, so every write path (ORM or raw SQL) is covered.
+CAMPAIGN_SEARCH_TABLE = "campaigns_fts"
+
+CAMPAIGN_SEARCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {CAMPAIGN_SEARCH_TABLE} USING fts5(
+        name, description,
+        content='campaigns', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS campaigns_fts_ai AFTER INSERT ON campaigns BEGIN
+        INSERT INTO {CAMPAIGN_SEARCH_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS campaigns_fts_ad AFTER DELETE ON campaigns BEGIN
+        INSERT INTO {CAMPAIGN_SEARCH_TABLE}({CAMPAIGN_SEARCH_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS campaigns_fts_au AFTER UPDATE OF name, description ON campaigns BEGIN
+        INSERT INTO {CAMPAIGN_SEARCH_TABLE}({CAMPAIGN_SEARCH_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {CAMPAIGN_SEARCH_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+for _statement in CAMPAIGN_SEARCH_DDL:
+    event.listen(
+        Campaign.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+
+event.listen(
+    Campaign.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {CAMPAIGN_SEARCH_TABLE}").execute_if(dialect="sqlite"),
+)
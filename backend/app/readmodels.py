@@ -0,0 +1,46 @@
+# Lightweight read-only row objects for list endpoints.
+# A full models.Campaign instance carries SQLAlchemy instrumentation state and
+# is registered in the session identity map, only to be thrown away once the
+# response is serialized. List queries select plain columns instead and wrap
+# each row in a __slots__ object: no __dict__, no session bookkeeping.
+
+from sqlalchemy import select
+
+from . import models
+
+
+class CampaignRow:
+    """
+    Read-only campaign row, accepted by schemas.Campaign (from_attributes).
+    """
+    __slots__ = ("id", "name", "description", "start_date", "end_date", "budget", "status")
+
+    def __init__(self, id, name, description, start_date, end_date, budget, status):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.start_date = start_date
+        self.end_date = end_date
+        self.budget = budget
+        self.status = status
+
+    def __repr__(self) -> str:
+        return f"CampaignRow(id={self.id!r}, name={self.name!r})"
+
+
+# Columns selected for a CampaignRow, in constructor order.
+CAMPAIGN_ROW_COLUMNS = tuple(models.Campaign.__table__.c[name] for name in CampaignRow.__slots__)
+
+
+def select_campaign_rows():
+    """
+    Column select matching CampaignRow, to be completed with filters/pagination.
+    """
+    return select(*CAMPAIGN_ROW_COLUMNS)
+
+
+def to_campaign_rows(result) -> list:
+    """
+    Wrap the rows of an executed select_campaign_rows() statement.
+    """
+    return [CampaignRow(*row) for row in result]
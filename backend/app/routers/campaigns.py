@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Callable, List, Optional
 
-from .. import crud, models, schemas
-from ..dependencies import get_db, get_current_user
+from .. import crud, export, metrics, models, schemas
+from ..coalescing import SingleFlight
+from ..dependencies import get_campaign_db, get_current_user
 
 router = APIRouter(
     prefix="/campaigns",
@@ -11,51 +14,205 @@ router = APIRouter(
     dependencies=[Depends(get_current_user)]
 )
 
+# --- Read Coalescing ---
+# Concurrent identical reads (same path, query parameters and user) share one
+# query and one serialized JSON body instead of each running their own.
+read_flight = SingleFlight("campaigns.read")
+metrics.register_collector(read_flight.collect)
+
+_campaign_adapter = TypeAdapter(schemas.Campaign)
+_campaign_list_adapter = TypeAdapter(List[schemas.Campaign])
+_campaign_partial_list_adapter = TypeAdapter(List[schemas.CampaignPartial])
+_campaign_changes_adapter = TypeAdapter(schemas.CampaignChanges)
+
+async def _coalesced_json(
+        request: Request,
+        current_user: models.User,
+        adapter: TypeAdapter,
+        compute: Callable[[], Any],
+        exclude_unset: bool = False,
+) -> Response:
+    """
+    Run compute() and serialize its result with 'adapter' in the threadpool,
+    sharing both steps with identical requests already in flight.
+    """
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())), current_user.id)
+
+    def serialize() -> bytes:
+        value = adapter.validate_python(compute(), from_attributes=True)
+        return adapter.dump_json(value, exclude_unset=exclude_unset)
+
+    return Response(content=await read_flight.do(key, serialize), media_type="application/json")
+
 @router.post("/", response_model=schemas.Campaign, status_code=status.HTTP_201_CREATED)
 def create_campaign(
         campaign: schemas.CampaignCreate,
-        db: Session = Depends(get_db)
+        current_user: models.User = Depends(get_current_user),
+        db: Session = Depends(get_campaign_db)
+):
+    """
+    Create a new campaign owned by the current user.
+    """
+    return crud.create_campaign(db=db, owner_id=current_user.id, campaign=campaign)
+
+# Upper bound on 'ids=' so a single request can't build an unbounded IN (...) list.
+MAX_IDS_PER_REQUEST = 500
+# Largest integer SQLite can store (signed 64-bit): bounds ids and sync versions, as larger
+# values overflow the driver.
+MAX_CAMPAIGN_ID = 2**63 - 1
+
+def _parse_ids(ids: Optional[str]) -> Optional[List[int]]:
+    """
+    Parse the 'ids' query parameter ("1,2,3") into a list of unique ids.
+    """
+    if ids is None:
+        return None
+    try:
+        parsed = sorted({int(value) for value in ids.split(",") if value.strip()})
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be a comma-separated list of integers")
+    if len(parsed) > MAX_IDS_PER_REQUEST:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_IDS_PER_REQUEST} ids per request")
+    if parsed and not (1 <= parsed[0] and parsed[-1] <= MAX_CAMPAIGN_ID):
+        raise HTTPException(status_code=422, detail=f"ids must be between 1 and {MAX_CAMPAIGN_ID}")
+    return parsed
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse the 'fields' query parameter ("name,budget") into a list of campaign columns.
+    The id is always included.
+    """
+    if fields is None:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in schemas.Campaign.model_fields]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [field for field in schemas.Campaign.model_fields if field in requested and field != "id"]
+
+@router.get("/", response_model=List[schemas.CampaignPartial], response_model_exclude_unset=True)
+async def read_campaigns(
+        request: Request,
+        skip: int = 0,
+        limit: int = 100,
+        ids: Optional[str] = Query(None, description="Comma-separated campaign ids to fetch in one query, e.g. 1,2,3"),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,budget (id is always included)"),
+        include_archived: bool = Query(False, description="Also return archived (long finished) campaigns"),
+        current_user: models.User = Depends(get_current_user),
+        db: Session = Depends(get_campaign_db)
 ):
     """
-    Create a new campaign.
+    Retrieve a list of campaigns with pagination, or specific campaigns with 'ids'.
+    Use 'fields' to return only some columns (e.g. skip the description in large lists).
     """
-    return crud.create_campaign(db=db, campaign=campaign)
+    parsed_ids, parsed_fields = _parse_ids(ids), _parse_fields(fields)
+    return await _coalesced_json(
+        request, current_user, _campaign_partial_list_adapter,
+        lambda: crud.get_campaigns(
+            db, owner_id=current_user.id, skip=skip, limit=limit,
+            ids=parsed_ids, fields=parsed_fields, include_archived=include_archived,
+        ),
+        exclude_unset=True,
+    )
 
-@router.get("/", response_model=List[schemas.Campaign])
-def read_campaigns(
+@router.get("/search", response_model=List[schemas.Campaign])
+async def search_campaigns(
+        request: Request,
+        q: str = Query(..., min_length=1, description="Words to find in the name or description (prefix match)"),
         skip: int = 0,
         limit: int = 100,
-        db: Session = Depends(get_db)
+        current_user: models.User = Depends(get_current_user),
+        db: Session = Depends(get_campaign_db)
 ):
     """
-    Retrieve a list of campaigns with pagination.
+    Full-text search over campaign names and descriptions, ranked by relevance.
     """
-    campaigns = crud.get_campaigns(db, skip=skip, limit=limit)
-    return campaigns
+    return await _coalesced_json(
+        request, current_user, _campaign_list_adapter,
+        lambda: crud.search_campaigns(db, owner_id=current_user.id, q=q, skip=skip, limit=limit),
+    )
+
+@router.get("/changes", response_model=schemas.CampaignChanges)
+async def read_campaign_changes(
+        request: Request,
+        since: int = Query(0, ge=0, le=MAX_CAMPAIGN_ID, description="Version returned by the previous sync (0 for a full sync)"),
+        limit: int = Query(1000, ge=1, le=10000),
+        current_user: models.User = Depends(get_current_user),
+        db: Session = Depends(get_campaign_db)
+):
+    """
+    Retrieve the campaigns created, updated or deleted since a sync version.
+    Returns 410 Gone if those changes were compacted: the client must resync from 0.
+    """
+    def compute():
+        if 0 < since < crud.get_sync_state(db).horizon:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Changes since this version are no longer available, resync from version 0",
+            )
+        changed, deleted, version, has_more = crud.get_campaign_changes(
+            db, owner_id=current_user.id, since=since, limit=limit
+        )
+        return {"version": version, "changed": changed, "deleted": deleted, "has_more": has_more}
+
+    return await _coalesced_json(request, current_user, _campaign_changes_adapter, compute)
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in export.EXPORT_FORMATS.values()}}},
+)
+def export_campaigns(
+        format: str = Query("parquet", pattern="^(arrow|parquet)$", description="arrow (IPC stream) or parquet"),
+        include_archived: bool = Query(False, description="Also export archived campaigns"),
+        current_user: models.User = Depends(get_current_user),
+        db: Session = Depends(get_campaign_db)
+):
+    """
+    Export all the current user's campaigns in a columnar format for analytics, streamed batch by batch.
+    """
+    if not export.is_available():
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Export requires pyarrow")
+
+    batches = export.iter_campaign_batches(db, owner_id=current_user.id, include_archived=include_archived)
+    return StreamingResponse(
+        export.stream_export(batches, format),
+        media_type=export.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="campaigns.{format}"'},
+    )
 
 @router.get("/{campaign_id}", response_model=schemas.Campaign)
-def read_campaign(
+async def read_campaign(
         campaign_id: int,
-        db: Session = Depends(get_db)
+        request: Request,
+        include_archived: bool = Query(False, description="Also look for the campaign in the archive"),
+        current_user: models.User = Depends(get_current_user),
+        db: Session = Depends(get_campaign_db)
 ):
     """
     Retrieve a single campaign by its ID.
     """
-    db_campaign = crud.get_campaign(db, campaign_id=campaign_id)
-    if db_campaign is None:
-        raise HTTPException(status_code=404, detail="Campaign not found")
-    return db_campaign
+    def compute():
+        db_campaign = crud.get_campaign(
+            db, owner_id=current_user.id, campaign_id=campaign_id, include_archived=include_archived
+        )
+        if db_campaign is None:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+        return db_campaign
+
+    return await _coalesced_json(request, current_user, _campaign_adapter, compute)
 
 @router.put("/{campaign_id}", response_model=schemas.Campaign)
 def update_campaign(
         campaign_id: int,
         campaign_in: schemas.CampaignUpdate,
-        db: Session = Depends(get_db)
+        current_user: models.User = Depends(get_current_user),
+        db: Session = Depends(get_campaign_db)
 ):
     """
     Update an existing campaign by its ID.
     """
-    db_campaign = crud.get_campaign(db, campaign_id=campaign_id)
+    db_campaign = crud.get_campaign(db, owner_id=current_user.id, campaign_id=campaign_id)
     if db_campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
@@ -64,12 +221,13 @@ def update_campaign(
 @router.delete("/{campaign_id}", response_model=schemas.Campaign)
 def delete_campaign(
         campaign_id: int,
-        db: Session = Depends(get_db)
+        current_user: models.User = Depends(get_current_user),
+        db: Session = Depends(get_campaign_db)
 ):
     """
     Delete a campaign by its ID.
     """
-    db_campaign = crud.get_campaign(db, campaign_id=campaign_id)
+    db_campaign = crud.get_campaign(db, owner_id=current_user.id, campaign_id=campaign_id)
     if db_campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
@@ -78,12 +236,13 @@ def delete_campaign(
 @router.patch("/{campaign_id}/toggle", response_model=schemas.Campaign)
 def toggle_campaign_status(
         campaign_id: int,
-        db: Session = Depends(get_db)
+        current_user: models.User = Depends(get_current_user),
+        db: Session = Depends(get_campaign_db)
 ):
     """
     Toggle the status (active/inactive) of a campaign.
     """
-    db_campaign = crud.get_campaign(db, campaign_id=campaign_id)
+    db_campaign = crud.get_campaign(db, owner_id=current_user.id, campaign_id=campaign_id)
     if db_campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
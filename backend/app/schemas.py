@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
 # --- Campaign Schemas ---
@@ -42,6 +42,31 @@ class Campaign(CampaignBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class CampaignPartial(BaseModel):
+    """
+    Schema for reading a campaign with a sparse fieldset ('fields=' parameter).
+    Every field is optional; fields that were not selected are left out of the response.
+    """
+    id: Optional[int] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    budget: Optional[float] = None
+    status: Optional[bool] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CampaignChanges(BaseModel):
+    """
+    Schema for a delta sync response.
+    'version' is the value to send as 'since' on the next sync.
+    """
+    version: int
+    changed: List[Campaign]
+    deleted: List[int]
+    has_more: bool
+
 
 # --- User Schemas ---
 
@@ -0,0 +1,260 @@
+# Tenant sharding: each owner's campaigns live on one shard.
+# A single SQLite file allows one writer at a time, so with many advertisers
+# every write queues behind every other. A ShardRouter maps owners to separate
+# SQLite files, each with its own engine and connection pool, so writes for
+# owners on different shards run in parallel. Users (and logins) stay in the
+# main database; only the campaign tables are sharded.
+#
+# The default SingleShardRouter keeps everything in the main database. Set
+# CAMPAIGN_SHARD_DIR to switch to a FileShardRouter; rebalance_shards.py moves
+# owners between shards.
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from . import models
+from .database import Base, SessionLocal
+
+# The tables stored on a shard (the main database has them all).
+SHARD_TABLES = [
+    models.Campaign.__table__,
+    models.ArchivedCampaign.__table__,
+    models.CampaignTombstone.__table__,
+    models.SyncState.__table__,
+]
+
+# Campaign ids must stay unique across shards so an owner can be moved without
+# renumbering its campaigns: shard N hands out ids from (N + 1) << SHARD_ID_BITS
+# (ids below 2**40 belong to the main database). 2**40 ids per shard, and up to
+# 8191 shards before ids outgrow what JavaScript clients can represent exactly.
+SHARD_ID_BITS = 40
+CAMPAIGN_IDS = "campaign_ids"  # SyncState counter holding the last id handed out on a shard
+
+
+class ShardRouter(ABC):
+    """
+    Maps campaign owners to the database holding their campaigns.
+    """
+
+    @abstractmethod
+    def shard_for(self, owner_id: int) -> str:
+        """
+        Name of the shard holding the campaigns of 'owner_id'.
+        """
+
+    @abstractmethod
+    def shards(self) -> List[str]:
+        """
+        Names of all shards (for maintenance jobs that must visit each one).
+        """
+
+    @abstractmethod
+    def open_shard(self, shard: str) -> Session:
+        """
+        New session on 'shard'. The caller closes it.
+        """
+
+    def session(self, owner_id: int, db: Session) -> Session:
+        """
+        Session for the campaigns of 'owner_id' during a request whose main
+        database session is 'db'. Returns 'db' itself when the campaigns live
+        in the main database; any other session must be closed by the caller.
+        """
+        return self.open_shard(self.shard_for(owner_id))
+
+
+class SingleShardRouter(ShardRouter):
+    """
+    No sharding: all campaigns live in the main database.
+    """
+    MAIN = "main"
+
+    def shard_for(self, owner_id: int) -> str:
+        return self.MAIN
+
+    def shards(self) -> List[str]:
+        return [self.MAIN]
+
+    def open_shard(self, shard: str) -> Session:
+        return SessionLocal()
+
+    def session(self, owner_id: int, db: Session) -> Session:
+        return db
+
+
+def _configure_connection(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode = WAL")  # readers don't block the shard's writer
+    cursor.execute("PRAGMA synchronous = NORMAL")
+    cursor.execute("PRAGMA busy_timeout = 5000")
+    cursor.close()
+
+
+class FileShardRouter(ShardRouter):
+    """
+    One SQLite file per shard in 'directory' (shard-0.db, shard-1.db, ...).
+
+    Owners are placed by 'owner_id % hash_shards' unless placements.json
+    pins them to a shard (written by rebalance_shards.py when an owner is
+    moved). 'hash_shards' is fixed when the directory is created, so adding
+    shards never moves an owner implicitly: new shards only receive owners
+    that are moved there. The placement file is reloaded when it changes.
+    """
+    PLACEMENTS_FILE = "placements.json"
+
+    def __init__(self, directory: str, shard_count: int = 4):
+        self.directory = directory
+        self.placements_path = os.path.join(directory, self.PLACEMENTS_FILE)
+        self._lock = threading.Lock()
+        self._engines: Dict[int, Engine] = {}
+        self._sessions: Dict[int, sessionmaker] = {}
+        self._placements_stamp: Optional[tuple] = None
+
+        os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self.placements_path):
+            self.hash_shards, self.shard_count, self.owners = shard_count, shard_count, {}
+            self._save_placements()
+        self._load_placements()
+
+    # --- Placements ---
+
+    def _load_placements(self) -> None:
+        stat = os.stat(self.placements_path)
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp == self._placements_stamp:
+            return
+        with open(self.placements_path) as file:
+            placements = json.load(file)
+        self.hash_shards = placements["hash_shards"]
+        self.shard_count = placements["shards"]
+        self.owners = {int(owner): shard for owner, shard in placements["owners"].items()}
+        self._placements_stamp = stamp
+
+    def _save_placements(self) -> None:
+        # Write then rename, so a server reloading the file never sees half of it.
+        temporary = f"{self.placements_path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump({
+                "hash_shards": self.hash_shards,
+                "shards": self.shard_count,
+                "owners": {str(owner): shard for owner, shard in sorted(self.owners.items())},
+            }, file, indent=2)
+        os.replace(temporary, self.placements_path)
+        self._placements_stamp = None
+
+    def place(self, owner_id: int, shard: str) -> None:
+        """
+        Pin 'owner_id' to 'shard' (after its campaigns were copied there).
+        """
+        index = self.shard_index(shard)
+        with self._lock:
+            self._load_placements()
+            if index == owner_id % self.hash_shards:
+                self.owners.pop(owner_id, None)
+            else:
+                self.owners[owner_id] = index
+            self._save_placements()
+
+    def add_shards(self, count: int) -> List[str]:
+        """
+        Create 'count' new, empty shards. Returns their names.
+        """
+        with self._lock:
+            self._load_placements()
+            first = self.shard_count
+            self.shard_count += count
+            self._save_placements()
+        return [self.shard_name(index) for index in range(first, first + count)]
+
+    # --- Routing ---
+
+    @staticmethod
+    def shard_name(index: int) -> str:
+        return f"shard-{index}"
+
+    def shard_index(self, shard: str) -> int:
+        self._load_placements()
+        index = int(shard.rpartition("-")[2])
+        if not 0 <= index < self.shard_count:
+            raise ValueError(f"Unknown shard: {shard}")
+        return index
+
+    def shard_for(self, owner_id: int) -> str:
+        self._load_placements()
+        return self.shard_name(self.owners.get(owner_id, owner_id % self.hash_shards))
+
+    def shards(self) -> List[str]:
+        self._load_placements()
+        return [self.shard_name(index) for index in range(self.shard_count)]
+
+    def shard_path(self, shard: str) -> str:
+        return os.path.join(self.directory, f"{shard}.db")
+
+    def engine(self, shard: str) -> Engine:
+        """
+        Engine (and pool) of 'shard', created with its tables on first use.
+        """
+        index = self.shard_index(shard)
+        engine = self._engines.get(index)
+        if engine is not None:
+            return engine
+        with self._lock:
+            if index not in self._engines:
+                engine = create_engine(
+                    f"sqlite:///{self.shard_path(shard)}", connect_args={"check_same_thread": False}
+                )
+                event.listen(engine, "connect", _configure_connection)
+                Base.metadata.create_all(bind=engine, tables=SHARD_TABLES)
+                self._init_id_block(engine, index)
+                self._sessions[index] = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                self._engines[index] = engine
+            return self._engines[index]
+
+    @staticmethod
+    def _init_id_block(engine: Engine, index: int) -> None:
+        with Session(engine) as db:
+            if db.scalar(select(models.SyncState).where(models.SyncState.name == CAMPAIGN_IDS)) is None:
+                db.add(models.SyncState(name=CAMPAIGN_IDS, version=(index + 1) << SHARD_ID_BITS, horizon=0))
+                db.commit()
+
+    def open_shard(self, shard: str) -> Session:
+        self.engine(shard)
+        return self._sessions[self.shard_index(shard)]()
+
+    def dispose(self) -> None:
+        """
+        Close every shard's connection pool.
+        """
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+            self._sessions.clear()
+
+
+def default_router() -> ShardRouter:
+    """
+    Router configured by the environment: CAMPAIGN_SHARD_DIR (and
+    CAMPAIGN_SHARD_COUNT for a new directory) select file shards.
+    """
+    directory = os.getenv("CAMPAIGN_SHARD_DIR")
+    if directory:
+        return FileShardRouter(directory, int(os.getenv("CAMPAIGN_SHARD_COUNT", "4")))
+    return SingleShardRouter()
+
+
+shard_router: ShardRouter = default_router()
+
+
+def get_shard_router() -> ShardRouter:
+    """
+    FastAPI dependency returning the configured shard router (overridable in tests).
+    """
+    return shard_router
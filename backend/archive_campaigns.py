@@ -0,0 +1,28 @@
+import argparse
+from datetime import timedelta
+
+from app.database import engine, Base
+from app.crud import archive_finished_campaigns, optimize_campaign_search_index
+from app.sharding import shard_router
+
+# Moves finished campaigns out of the live 'campaigns' table into
+# 'campaigns_archive', in batched transactions. Archived campaigns are only
+# returned by the API with include_archived=true. Run it periodically, e.g. from cron.
+# With file shards (CAMPAIGN_SHARD_DIR), every shard is archived in turn.
+
+parser = argparse.ArgumentParser(description="Archive finished campaigns.")
+parser.add_argument("--days", type=int, default=90, help="Archive campaigns that ended more than this many days ago (default: 90)")
+parser.add_argument("--batch-size", type=int, default=500, help="Campaigns moved per transaction (default: 500)")
+args = parser.parse_args()
+
+Base.metadata.create_all(bind=engine)
+
+for shard in shard_router.shards():
+    db = shard_router.open_shard(shard)
+    try:
+        archived = archive_finished_campaigns(db, older_than=timedelta(days=args.days), batch_size=args.batch_size)
+        print(f"[{shard}] Archived {archived} campaigns that ended more than {args.days} days ago.")
+        if archived:
+            optimize_campaign_search_index(db)
+    finally:
+        db.close()
@@ -0,0 +1,102 @@
+"""
+Hot-path query latency before and after archiving a 90%-finished dataset.
+
+Fills a temporary database where 90% of the campaigns ended long ago, times
+the live-list queries, runs the archival job, then times them again.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_archive --rows 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+from app.database import Base
+
+OWNER_ID = 1  # all benchmark campaigns belong to one owner
+
+
+def fill(engine, rows: int, finished_share: float, seed: int = 42):
+    rng = random.Random(seed)
+    today = date.today()
+    batch = []
+    with engine.begin() as conn:
+        raw = conn.connection.driver_connection
+        for i in range(rows):
+            if rng.random() < finished_share:
+                end = today - timedelta(days=rng.randrange(120, 1500))
+            else:
+                end = today + timedelta(days=rng.randrange(-30, 120))
+            batch.append((
+                f"Campaign {i}", "Benchmark campaign", (end - timedelta(days=30)).isoformat(),
+                end.isoformat(), 1000.0, rng.random() < 0.7,
+            ))
+            if len(batch) == 10_000 or i == rows - 1:
+                raw.executemany(
+                    "INSERT INTO campaigns (owner_id, name, description, start_date, end_date, budget, status) "
+                    f"VALUES ({OWNER_ID}, ?, ?, ?, ?, ?, ?)",
+                    batch,
+                )
+                batch.clear()
+
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def hot_queries(db):
+    live = db.query(func.count(models.Campaign.id)).scalar()
+    return {
+        "first page (100)": lambda: crud.get_campaigns(db, OWNER_ID, skip=0, limit=100),
+        "last page (100)": lambda: crud.get_campaigns(db, OWNER_ID, skip=max(live - 100, 0), limit=100),
+        "count active": lambda: db.query(func.count(models.Campaign.id)).filter(models.Campaign.status.is_(True)).scalar(),
+        "search 'campaign 12'": lambda: crud.search_campaigns(db, OWNER_ID, q="campaign 12", limit=20),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--finished", type=float, default=0.9, help="Share of long-finished campaigns")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_archive.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    fill(engine, args.rows, args.finished)
+    db = sessionmaker(bind=engine)()
+
+    before = {name: median_ms(fn, args.repeat) for name, fn in hot_queries(db).items()}
+
+    started = time.perf_counter()
+    archived = crud.archive_finished_campaigns(db, older_than=timedelta(days=90), batch_size=5000)
+    print(f"Archived {archived} of {args.rows} campaigns in {time.perf_counter() - started:.1f}s")
+    crud.optimize_campaign_search_index(db)
+    db.execute(text("ANALYZE"))
+
+    after = {name: median_ms(fn, args.repeat) for name, fn in hot_queries(db).items()}
+
+    print(f"{'query':<24}{'before ms':>11}{'after ms':>11}")
+    for name in before:
+        print(f"{name:<24}{before[name]:>11.2f}{after[name]:>11.2f}")
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+CPU cost versus bytes saved when compressing campaign list payloads.
+
+For each page size, serializes a page of campaigns like GET /campaigns/ does,
+then times every available encoder and the cache hit path of the middleware
+(digest + lookup) that repeated responses take instead.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_compression --pages 10,100,1000,5000
+"""
+import argparse
+import hashlib
+import random
+import time
+from datetime import date, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app import schemas
+from app.compression import ENCODERS
+
+WORDS = ["summer", "sale", "brand", "awareness", "retargeting", "video", "display",
+         "holiday", "loyalty", "newsletter", "premium", "launch", "social", "mobile"]
+
+
+def page(size: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    campaigns = []
+    for i in range(size):
+        start = date(2025, 1, 1) + timedelta(days=rng.randrange(365))
+        campaigns.append(schemas.Campaign(
+            id=i + 1,
+            name=" ".join(rng.choices(WORDS, k=3)).title(),
+            description=" ".join(rng.choices(WORDS, k=rng.randrange(10, 40))),
+            start_date=start,
+            end_date=start + timedelta(days=rng.randrange(1, 90)),
+            budget=round(rng.uniform(100, 50000), 2),
+            status=rng.random() < 0.7,
+        ))
+    return TypeAdapter(List[schemas.Campaign]).dump_json(campaigns)
+
+
+def per_call_ms(fn, body: bytes, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(body)
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", default="10,100,1000,5000", help="Comma-separated page sizes")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6}{'raw KB':>10}{'encoding':>10}{'out KB':>10}{'saved':>8}{'ms':>9}{'MB/s':>9}")
+    for size in (int(value) for value in args.pages.split(",")):
+        body = page(size)
+        raw_kb = len(body) / 1024
+        for name, encode in ENCODERS.items():
+            out = encode(body)
+            ms = per_call_ms(encode, body, args.repeat)
+            print(f"{size:>6}{raw_kb:>10.1f}{name:>10}{len(out) / 1024:>10.1f}"
+                  f"{1 - len(out) / len(body):>8.0%}{ms:>9.3f}{len(body) / 1048576 / (ms / 1000):>9.0f}")
+        ms = per_call_ms(lambda b: hashlib.blake2b(b, digest_size=16).digest(), body, args.repeat)
+        print(f"{size:>6}{raw_kb:>10.1f}{'cached':>10}{'':>10}{'':>8}{ms:>9.3f}{len(body) / 1048576 / (ms / 1000):>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Export time and size: JSON list pages versus Arrow IPC and Parquet.
+
+JSON is produced the way the analytics team pulls it today: GET /campaigns/
+pages of 1000 (crud.get_campaigns + response serialization), without HTTP.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_export --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, export, schemas
+from app.database import Base
+from benchmarks.bench_search import OWNER_ID, fill
+
+JSON_PAGE = 1000
+
+
+def export_json(db, path: str) -> int:
+    adapter = TypeAdapter(List[schemas.Campaign])
+    rows, skip = 0, 0
+    with open(path, "wb") as out:
+        while True:
+            page = crud.get_campaigns(db, OWNER_ID, skip=skip, limit=JSON_PAGE)
+            if not page:
+                break
+            out.write(adapter.dump_json(adapter.validate_python(page, from_attributes=True)))
+            db.expunge_all()
+            rows += len(page)
+            skip += JSON_PAGE
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if not export.is_available():
+        raise SystemExit("This benchmark requires pyarrow")
+
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "bench_export.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    fill(engine, args.rows)
+    db = sessionmaker(bind=engine)()
+
+    runs = [
+        ("json", lambda out: export_json(db, out)),
+        ("arrow", lambda out: export.write_export(export.iter_campaign_batches(db), "arrow", out)),
+        ("parquet", lambda out: export.write_export(export.iter_campaign_batches(db), "parquet", out)),
+    ]
+    print(f"{'format':<10}{'rows':>10}{'seconds':>10}{'MB':>10}{'rows/s':>12}")
+    for name, run in runs:
+        out = os.path.join(workdir, f"campaigns.{name}")
+        started = time.perf_counter()
+        rows = run(out)
+        seconds = time.perf_counter() - started
+        size = os.path.getsize(out) / 1048576
+        print(f"{name:<10}{rows:>10}{seconds:>10.2f}{size:>10.1f}{rows / seconds:>12.0f}")
+        os.remove(out)
+
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+List endpoint throughput: full ORM objects versus __slots__ CampaignRow rows.
+
+Times loading a page and serializing it to JSON as GET /campaigns/ does,
+and reports the memory held per row while the page is alive.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_readmodels --pages 100,1000,10000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import date
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, schemas
+from app.database import Base
+
+OWNER_ID = 1  # all benchmark campaigns belong to one owner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", default="100,1000,10000", help="Comma-separated page sizes")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    sizes = [int(value) for value in args.pages.split(",")]
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all(
+        models.Campaign(
+            owner_id=OWNER_ID, name=f"Campaign {i}", description="Benchmark campaign " * 5, start_date=date(2025, 1, 1),
+            end_date=date(2025, 3, 31), budget=1000.0, status=i % 3 != 0,
+        )
+        for i in range(max(sizes))
+    )
+    db.commit()
+    db.expunge_all()
+
+    adapter = TypeAdapter(List[schemas.Campaign])
+    loaders = {
+        "orm": lambda size: db.query(models.Campaign).limit(size).all(),
+        "rows": lambda size: crud.get_campaigns(db, OWNER_ID, limit=size),
+    }
+
+    print(f"{'rows':>7}{'model':>7}{'load+json ms':>14}{'rows/s':>12}{'bytes/row':>11}")
+    for size in sizes:
+        for name, load in loaders.items():
+            def run():
+                body = adapter.dump_json(adapter.validate_python(load(size), from_attributes=True))
+                db.expunge_all()  # like closing the request session
+                return body
+
+            run()
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                run()
+            ms = (time.perf_counter() - started) * 1000 / args.repeat
+
+            gc.collect()
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            page = load(size)
+            per_row = (tracemalloc.get_traced_memory()[0] - before) / size
+            tracemalloc.stop()
+            del page
+            db.expunge_all()
+
+            print(f"{size:>7}{name:>7}{ms:>14.2f}{size / ms * 1000:>12.0f}{per_row:>11.0f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Latency benchmark: FTS5 campaign search versus a LIKE '%x%' scan.
+
+FTS ranks every match with bm25, so a word present in most rows costs more
+than a LIKE that stops at the first 20 unranked hits; selective words are
+where the index pays off, since LIKE has to scan the whole table for them.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_search --rows 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+from app.database import Base
+
+OWNER_ID = 1  # all benchmark campaigns belong to one owner
+
+WORDS = [
+    "summer", "winter", "spring", "autumn", "sale", "launch", "brand", "awareness",
+    "retargeting", "video", "display", "search", "social", "mobile", "holiday",
+    "black", "friday", "cyber", "monday", "flash", "deal", "premium", "loyalty",
+    "newsletter", "influencer", "outdoor", "audio", "podcast", "streaming", "promo",
+]
+SYLLABLES = ["ka", "lo", "mi", "ra", "zen", "tor", "vi", "ne", "qua", "sol", "dex", "bri", "mo", "tan"]
+# Common words first, then a long tail of brand-like words: picked with Zipf
+# weights, so queries range from "matches everything" to "matches a few rows".
+QUERIES = ["sale", "summer sale", "retarg", "podcast audio", "kalomi", "zentor vine", "quasol"]
+
+
+def vocabulary(rng: random.Random, size: int = 2_000):
+    words = list(WORDS)
+    seen = set(words)
+    while len(words) < size:
+        word = "".join(rng.choices(SYLLABLES, k=rng.randrange(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words, [1 / (rank + 1) for rank in range(len(words))]
+
+
+def fill(engine, rows: int, seed: int = 42):
+    """Insert `rows` random campaigns (the FTS triggers index them on the way in)."""
+    rng = random.Random(seed)
+    words, weights = vocabulary(rng)
+    start = date(2024, 1, 1)
+    batch = []
+    with engine.begin() as conn:
+        raw = conn.connection.driver_connection
+        for i in range(rows):
+            begin = start + timedelta(days=rng.randrange(730))
+            batch.append((
+                " ".join(rng.choices(words, weights, k=3)).title(),
+                " ".join(rng.choices(words, weights, k=rng.randrange(8, 25))),
+                begin.isoformat(),
+                (begin + timedelta(days=rng.randrange(1, 90))).isoformat(),
+                round(rng.uniform(100, 50000), 2),
+                rng.random() < 0.7,
+            ))
+            if len(batch) == 10_000 or i == rows - 1:
+                raw.executemany(
+                    "INSERT INTO campaigns (owner_id, name, description, start_date, end_date, budget, status) "
+                    f"VALUES ({OWNER_ID}, ?, ?, ?, ?, ?, ?)",
+                    batch,
+                )
+                batch.clear()
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_search.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+
+    started = time.perf_counter()
+    fill(engine, args.rows)
+    print(f"Inserted {args.rows} campaigns in {time.perf_counter() - started:.1f}s ({path})")
+
+    db = sessionmaker(bind=engine)()
+    print(f"{'query':<16}{'fts p50':>10}{'fts p95':>10}{'like p50':>11}{'like p95':>11}  (ms, limit 20)")
+    for q in QUERIES:
+        fts = timed(lambda: crud.search_campaigns(db, OWNER_ID, q=q, limit=20), args.repeat)
+        like = timed(
+            lambda: db.query(models.Campaign)
+            .filter(text("name LIKE :p OR description LIKE :p"))
+            .params(p=f"%{q}%")
+            .limit(20)
+            .all(),
+            args.repeat,
+        )
+        print(f"{q:<16}{fts[0]:>10.2f}{fts[1]:>10.2f}{like[0]:>11.2f}{like[1]:>11.2f}")
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
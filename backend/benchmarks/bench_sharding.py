@@ -0,0 +1,92 @@
+"""
+Multi-tenant write throughput: one SQLite file versus owners spread over shards.
+
+Each tenant is a separate process (like uvicorn workers serving different
+advertisers) creating campaigns through crud.create_campaign, one committed
+transaction per campaign, for a fixed time. The same load runs against a
+FileShardRouter with 1 shard (every writer queues on one file lock), then
+with more shards. Reports total writes/s and per-write latency.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_sharding --tenants 16 --shards 1,2,4,8 --seconds 5
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import List
+
+from app import crud, schemas
+from app.sharding import FileShardRouter
+
+CAMPAIGN = schemas.CampaignCreate(
+    name="Benchmark campaign", description="Multi-tenant write benchmark",
+    start_date=date(2025, 1, 1), end_date=date(2025, 1, 31), budget=1000.0,
+)
+
+
+def tenant_writes(directory: str, owner_id: int, start_at: float, seconds: float) -> List[float]:
+    """
+    Create campaigns for 'owner_id' from 'start_at' (wall clock) for 'seconds'.
+    Returns the latency of every write, in seconds.
+    """
+    router = FileShardRouter(directory)
+    db = router.open_shard(router.shard_for(owner_id))
+    latencies = []
+    try:
+        time.sleep(max(0.0, start_at - time.time()))
+        stop_at = time.perf_counter() + seconds
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            crud.create_campaign(db, owner_id, CAMPAIGN)
+            db.expunge_all()
+            latencies.append(time.perf_counter() - started)
+    finally:
+        db.close()
+        router.dispose()
+    return latencies
+
+
+def run(shards: int, tenants: int, seconds: float) -> List[float]:
+    directory = tempfile.mkdtemp()
+    try:
+        router = FileShardRouter(directory, shard_count=shards)
+        for shard in router.shards():
+            router.engine(shard)  # create the shard files before the clock starts
+        router.dispose()
+
+        start_at = time.time() + 2  # leave the processes time to start
+        with ProcessPoolExecutor(max_workers=tenants) as pool:
+            futures = [
+                pool.submit(tenant_writes, directory, owner_id, start_at, seconds)
+                for owner_id in range(1, tenants + 1)
+            ]
+            return [latency for future in futures for latency in future.result()]
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", type=int, default=min(16, os.cpu_count() * 2), help="Concurrent writer processes")
+    parser.add_argument("--shards", default="1,2,4,8", help="Comma-separated shard counts")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'shards':>6}{'tenants':>9}{'writes':>9}{'writes/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'speedup':>9}")
+    baseline = None
+    for shards in (int(value) for value in args.shards.split(",")):
+        latencies = sorted(run(shards, args.tenants, args.seconds))
+        throughput = len(latencies) / args.seconds
+        baseline = baseline or throughput
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{shards:>6}{args.tenants:>9}{len(latencies):>9}{throughput:>10.0f}"
+              f"{statistics.median(latencies) * 1000:>9.2f}{p99 * 1000:>9.2f}{throughput / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
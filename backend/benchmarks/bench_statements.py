@@ -0,0 +1,74 @@
+"""
+Python overhead per hot query: ORM Query objects (before) versus the prebuilt
+statements of app/statements.py (after).
+
+Uses an in-memory SQLite database with a handful of rows, so the time measured
+is almost entirely Python (query construction, cache key, result handling).
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_statements
+"""
+import argparse
+import time
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+from app.database import Base
+
+OWNER_ID = 1  # all benchmark campaigns belong to one owner
+
+
+def per_call_us(fn, repeat: int) -> float:
+    for _ in range(min(repeat, 500)):
+        fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1_000_000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20_000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(models.User(username="admin", hashed_password="x"))
+    db.add_all(
+        models.Campaign(owner_id=OWNER_ID, name=f"Campaign {i}", start_date=date(2025, 1, 1), end_date=date(2025, 1, 31), budget=1.0)
+        for i in range(10)
+    )
+    db.commit()
+
+    cases = [
+        (
+            "get_user_by_username",
+            lambda: db.query(models.User).filter(models.User.username == "admin").first(),
+            lambda: crud.get_user_by_username(db, username="admin"),
+        ),
+        (
+            "get_campaign",
+            lambda: db.query(models.Campaign).filter(models.Campaign.id == 5).first(),
+            lambda: crud.get_campaign(db, OWNER_ID, campaign_id=5),
+        ),
+        (
+            "get_campaigns (10 rows)",
+            lambda: db.query(models.Campaign).offset(0).limit(100).all(),
+            lambda: crud.get_campaigns(db, OWNER_ID, skip=0, limit=100),
+        ),
+    ]
+
+    print(f"{'query':<26}{'before us':>11}{'after us':>11}{'speedup':>9}")
+    for name, before, after in cases:
+        before_us, after_us = per_call_us(before, args.repeat), per_call_us(after, args.repeat)
+        print(f"{name:<26}{before_us:>11.1f}{after_us:>11.1f}{before_us / after_us:>8.2f}x")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Load test: a multi-worker uvicorn server against a generated dataset, driven by
+concurrent virtual users running a weighted mix of logins, list pages, detail
+reads, writes and status toggles.
+
+Starts 'uvicorn app.main:app --workers N' on the given SQLite file (see
+generate_dataset.py), logs every virtual user in as one of the generated users,
+then runs the mix for --duration seconds and reports throughput, status codes
+and p50/p95/p99 latency per route as JSON. Samples taken during --warmup are
+discarded.
+
+Run from the backend/ directory:
+    python generate_dataset.py loadtest.db --campaigns 1000000 --users 1000
+    python -m benchmarks.loadtest loadtest.db --workers 4 --concurrency 64 --duration 60 \\
+        --mix login=1,list=30,detail=50,write=10,toggle=9 --output results.json
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+OPERATIONS = ("login", "list", "detail", "write", "toggle")
+DEFAULT_MIX = "login=1,list=30,detail=50,write=10,toggle=9"
+
+# (route, status code or None on a transport error, latency in seconds, finished at)
+Sample = Tuple[str, Optional[int], float, float]
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation '{name}' (choose from {', '.join(OPERATIONS)})")
+        mix[name.strip()] = float(weight)
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("the mix needs at least one positive weight")
+    return mix
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(fraction * len(sorted_values) + 0.5))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class VirtualUser:
+    """
+    One simulated client: its own connection, credentials and bearer token.
+    Detail reads and toggles pick among the ids of the user's own campaigns
+    (campaigns are scoped to their owner), including the ones it creates.
+    """
+
+    def __init__(self, base_url: str, username: str, password: str, campaign_ids: List[int],
+                 page_size: int, rng: random.Random):
+        self.client = httpx.Client(base_url=base_url, timeout=30.0)
+        self.username = username
+        self.password = password
+        self.campaign_ids = campaign_ids
+        self.page_size = page_size
+        self.rng = rng
+        self.samples: List[Sample] = []
+
+    def request(self, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        finished = time.perf_counter()
+        self.samples.append((route, response.status_code if response else None, finished - started, finished))
+        return response
+
+    def login(self, stop_at: float = float("inf")) -> None:
+        """
+        Get a fresh token. Logins turned away by admission control (429/503)
+        are retried after Retry-After, so the user doesn't go on unauthenticated.
+        """
+        while time.perf_counter() < stop_at:
+            response = self.request("login", "POST", "/auth/token",
+                                    data={"username": self.username, "password": self.password})
+            if response is not None and response.status_code == 200:
+                self.client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+                return
+            if response is None or response.status_code not in (429, 503):
+                return
+            time.sleep(float(response.headers.get("retry-after", 1)))
+
+    def list(self) -> None:
+        skip = self.rng.randrange(max(1, len(self.campaign_ids) - self.page_size))
+        self.request("list", "GET", "/campaigns/", params={"skip": skip, "limit": self.page_size})
+
+    def random_campaign(self) -> int:
+        # An id no one owns when the user has no campaign yet: the request then measures a 404.
+        return self.rng.choice(self.campaign_ids) if self.campaign_ids else 0
+
+    def detail(self) -> None:
+        self.request("detail", "GET", f"/campaigns/{self.random_campaign()}")
+
+    def write(self) -> None:
+        start = date.today() + timedelta(days=self.rng.randrange(90))
+        response = self.request("write", "POST", "/campaigns/", json={
+            "name": f"Load test campaign {self.rng.randrange(1_000_000)}",
+            "description": "Created by the load-test harness.",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=self.rng.randint(1, 60))).isoformat(),
+            "budget": round(self.rng.uniform(100, 20000), 2),
+            "status": True,
+        })
+        if response is not None and response.status_code == 201:
+            self.campaign_ids.append(response.json()["id"])
+
+    def toggle(self) -> None:
+        self.request("toggle", "PATCH", f"/campaigns/{self.random_campaign()}/toggle")
+
+    def run(self, operations: List[str], weights: List[float], stop_at: float) -> None:
+        self.login(stop_at)
+        while time.perf_counter() < stop_at:
+            getattr(self, self.rng.choices(operations, cum_weights=weights)[0])()
+        self.client.close()
+
+
+def summarize(samples: List[Sample], measured_from: float, measured_to: float) -> Dict:
+    """
+    Per-route and total throughput, status counts and latency percentiles (ms).
+    """
+    elapsed = measured_to - measured_from
+    routes: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        if measured_from <= sample[3] <= measured_to:
+            routes[sample[0]].append(sample)
+            routes["total"].append(sample)
+
+    report = {"duration_s": round(elapsed, 2), "routes": {}}
+    for route in sorted(routes, key=lambda name: (name == "total", name)):
+        route_samples = routes[route]
+        latencies = sorted(sample[2] * 1000 for sample in route_samples)
+        statuses = Counter("error" if sample[1] is None else str(sample[1]) for sample in route_samples)
+        report["routes"][route] = {
+            "requests": len(route_samples),
+            "errors": sum(1 for sample in route_samples if sample[1] is None or sample[1] >= 400),
+            "statuses": dict(sorted(statuses.items())),
+            "throughput_rps": round(len(route_samples) / elapsed, 1),
+            "latency_ms": {
+                "mean": round(sum(latencies) / len(latencies), 2),
+                "p50": round(percentile(latencies, 0.50), 2),
+                "p95": round(percentile(latencies, 0.95), 2),
+                "p99": round(percentile(latencies, 0.99), 2),
+                "max": round(latencies[-1], 2),
+            },
+        }
+    return report
+
+
+def start_server(database: str, workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.abspath(database)}")
+    # The generated campaigns are all in this file: don't route owners to shards.
+    env.pop("CAMPAIGN_SHARD_DIR", None)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+
+
+def wait_until_ready(base_url: str, server: Optional[subprocess.Popen], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server not ready after {timeout:.0f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("database", help="SQLite file generated by generate_dataset.py")
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8077)
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=32, help="Virtual users")
+    parser.add_argument("--users", type=int, default=1000, help="Generated users to log in as (user1..userN)")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds discarded before measuring")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help=f"Operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--page-size", type=int, default=100, help="limit of list requests")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    usernames = [f"user{i % args.users + 1}" for i in range(args.concurrency)]
+    campaign_ids = defaultdict(list)
+    with sqlite3.connect(args.database) as conn:
+        for username, campaign_id in conn.execute(
+                "SELECT users.username, campaigns.id FROM campaigns JOIN users ON users.id = campaigns.owner_id "
+                f"WHERE users.username IN ({', '.join('?' * len(set(usernames)))})", sorted(set(usernames))):
+            campaign_ids[username].append(campaign_id)
+    campaigns_per_user = {username: len(campaign_ids[username]) for username in sorted(set(usernames))}
+
+    server = None if args.url else start_server(args.database, args.workers, args.port)
+    base_url = args.url or f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_ready(base_url, server)
+
+        operations = list(args.mix)
+        weights, total = [], 0.0
+        for name in operations:
+            total += args.mix[name]
+            weights.append(total)
+
+        rng = random.Random(args.seed)
+        virtual_users = [
+            VirtualUser(base_url, username, args.password, campaign_ids[username],
+                        args.page_size, random.Random(rng.random()))
+            for username in usernames
+        ]
+        started = time.perf_counter()
+        measured_from = started + args.warmup
+        measured_to = measured_from + args.duration
+        threads = [
+            threading.Thread(target=user.run, args=(operations, weights, measured_to))
+            for user in virtual_users
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = summarize([sample for user in virtual_users for sample in user.samples], measured_from, measured_to)
+    report["config"] = {
+        "workers": None if args.url else args.workers,
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        "page_size": args.page_size,
+        "campaigns_per_user": campaigns_per_user,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
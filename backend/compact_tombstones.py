@@ -0,0 +1,25 @@
+import argparse
+from datetime import timedelta
+
+from app.database import engine, Base
+from app.crud import compact_campaign_tombstones
+from app.sharding import shard_router
+
+# Removes old campaign tombstones (records of deleted campaigns kept for
+# GET /campaigns/changes). Clients that have not synced since then get a
+# 410 Gone and must resync from version 0. Run it periodically, e.g. from cron.
+# With file shards (CAMPAIGN_SHARD_DIR), every shard is compacted in turn.
+
+parser = argparse.ArgumentParser(description="Compact campaign delete tombstones.")
+parser.add_argument("--days", type=int, default=30, help="Keep tombstones younger than this (default: 30)")
+args = parser.parse_args()
+
+Base.metadata.create_all(bind=engine)
+
+for shard in shard_router.shards():
+    db = shard_router.open_shard(shard)
+    try:
+        removed = compact_campaign_tombstones(db, older_than=timedelta(days=args.days))
+        print(f"[{shard}] Removed {removed} tombstones older than {args.days} days.")
+    finally:
+        db.close()
@@ -0,0 +1,196 @@
+"""
+Synthetic dataset generator: fills a SQLite database with realistic users and
+campaigns, fast enough for millions of rows.
+
+Rows are written with executemany() in large batches on the raw sqlite3
+connection, with journaling and fsync off during the load; the search index is
+built once at the end instead of row by row through its triggers. The
+database is switched to WAL mode so the load-test server can read while writing.
+
+Campaigns are spread over the users (their owners) either evenly or with a
+Zipf-like skew: a few large advertisers and a long tail of small ones. All
+of them go to this one file (no shards): serve it without CAMPAIGN_SHARD_DIR.
+
+Usage (from the backend/ directory):
+    python generate_dataset.py loadtest.db --campaigns 1000000 --users 1000
+"""
+import argparse
+import itertools
+import math
+import random
+import time
+from datetime import date, timedelta
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.database import Base
+from app.dependencies import get_password_hash
+
+BATCH_SIZE = 20_000
+
+ADJECTIVES = ["Summer", "Winter", "Spring", "Autumn", "Holiday", "Flash", "Premium", "Weekend",
+              "Back to School", "Black Friday", "Cyber Monday", "New Year", "Loyalty", "Brand"]
+TOPICS = ["Sale", "Launch", "Awareness", "Retargeting", "Promo", "Giveaway", "Newsletter",
+          "Video Push", "Display Burst", "Social Boost", "Search Blitz", "App Installs"]
+CHANNELS = ["display", "video", "search", "social", "native", "audio", "connected TV", "email"]
+AUDIENCES = ["returning customers", "new visitors", "cart abandoners", "lookalike audiences",
+             "students", "young parents", "sports fans", "commuters", "gamers", "travellers"]
+
+USER_PREFIX = "user"
+
+
+def campaign_rows(
+        rng: random.Random,
+        count: int,
+        first_start: date,
+        last_start: date,
+        distribution: str,
+        active_share: float,
+) -> Iterator[Tuple]:
+    """
+    Yield campaign tuples (name, description, start_date, end_date, budget, status, version).
+    'uniform' spreads start dates evenly; 'recent' skews them towards last_start
+    (busy recent months, long tail of old campaigns).
+    """
+    span = (last_start - first_start).days
+    for i in range(count):
+        if distribution == "recent":
+            offset = int(span * math.sqrt(rng.random()))
+        else:
+            offset = rng.randrange(span + 1)
+        start = first_start + timedelta(days=offset)
+        duration = min(365, max(1, int(rng.lognormvariate(3.3, 0.6))))  # median ~4 weeks
+        channel = rng.choice(CHANNELS)
+        yield (
+            f"{rng.choice(ADJECTIVES)} {rng.choice(TOPICS)} {start.year} #{i + 1}",
+            f"{channel.capitalize()} campaign targeting {rng.choice(AUDIENCES)}"
+            f" and {rng.choice(AUDIENCES)} on {rng.choice(CHANNELS)}.",
+            start.isoformat(),
+            (start + timedelta(days=duration)).isoformat(),
+            round(rng.lognormvariate(8, 1.2), 2),  # median ~3000, long tail of big budgets
+            rng.random() < active_share,
+            i + 1,
+        )
+
+
+def owner_cum_weights(count: int, distribution: str) -> List[float]:
+    """
+    Cumulative weights for picking a campaign's owner among 'count' users:
+    equal for 'uniform', 1/rank for 'zipf'.
+    """
+    if distribution == "zipf":
+        return list(itertools.accumulate(1 / rank for rank in range(1, count + 1)))
+    return list(range(1, count + 1))
+
+
+def generate(
+        engine,
+        campaigns: int,
+        users: int,
+        password: str = "password123",
+        first_start: date = date(2023, 1, 1),
+        last_start: date = date(2026, 12, 31),
+        distribution: str = "recent",
+        active_share: float = 0.7,
+        owners: str = "zipf",
+        seed: int = 42,
+) -> None:
+    """
+    Create the tables and add 'users' users (user1..userN, all with 'password')
+    and 'campaigns' campaigns owned by them to the database behind 'engine'.
+    """
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        # The index is rebuilt in one pass at the end: cheaper than the per-row triggers.
+        for trigger in ("campaigns_fts_ai", "campaigns_fts_ad", "campaigns_fts_au"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("PRAGMA journal_mode = OFF")
+        cursor.execute("PRAGMA synchronous = OFF")
+
+        hashed_password = get_password_hash(password)  # bcrypt is slow: hash once, share it
+        cursor.executemany(
+            "INSERT OR IGNORE INTO users (username, hashed_password) VALUES (?, ?)",
+            ((f"{USER_PREFIX}{i}", hashed_password) for i in range(1, users + 1)),
+        )
+        usernames = {f"{USER_PREFIX}{i}" for i in range(1, users + 1)}
+        owner_ids = sorted(user_id for user_id, username in cursor.execute("SELECT id, username FROM users")
+                           if username in usernames)
+        owner_weights = owner_cum_weights(len(owner_ids), owners)
+
+        cursor.execute("SELECT coalesce(max(version), 0) FROM sync_state WHERE name = ?", (crud.CAMPAIGN_SYNC,))
+        base_version = cursor.fetchone()[0]
+        rows = campaign_rows(rng, campaigns, first_start, last_start, distribution, active_share)
+        while True:
+            batch = [row[:-1] + (base_version + row[-1],) for _, row in zip(range(BATCH_SIZE), rows)]
+            if not batch:
+                break
+            batch_owners = rng.choices(owner_ids, cum_weights=owner_weights, k=len(batch))
+            cursor.executemany(
+                "INSERT INTO campaigns (owner_id, name, description, start_date, end_date, budget, status, "
+                "updated_version) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(owner,) + row for owner, row in zip(batch_owners, batch)],
+            )
+        cursor.execute(
+            "INSERT INTO sync_state (name, version, horizon) VALUES (?, ?, 0) "
+            "ON CONFLICT (name) DO UPDATE SET version = excluded.version",
+            (crud.CAMPAIGN_SYNC, base_version + campaigns),
+        )
+        raw.commit()
+        cursor.execute("PRAGMA journal_mode = WAL").fetchall()
+        cursor.close()
+    finally:
+        raw.close()
+
+    db = sessionmaker(bind=engine)()
+    try:
+        crud.rebuild_campaign_search_index(db)
+        db.execute(text("ANALYZE"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic campaigns dataset.")
+    parser.add_argument("database", help="SQLite file to fill (created if missing)")
+    parser.add_argument("--campaigns", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--password", default="password123", help="Password of every generated user")
+    parser.add_argument("--first-start", type=date.fromisoformat, default=date(2023, 1, 1))
+    parser.add_argument("--last-start", type=date.fromisoformat, default=date(2026, 12, 31))
+    parser.add_argument("--distribution", choices=["uniform", "recent"], default="recent",
+                        help="Start date distribution (default: recent, skewed towards --last-start)")
+    parser.add_argument("--active-share", type=float, default=0.7, help="Share of active campaigns (default: 0.7)")
+    parser.add_argument("--owners", choices=["uniform", "zipf"], default="zipf",
+                        help="How campaigns are spread over users (default: zipf, a few large advertisers)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    generate(
+        create_engine(f"sqlite:///{args.database}"),
+        campaigns=args.campaigns,
+        users=args.users,
+        password=args.password,
+        first_start=args.first_start,
+        last_start=args.last_start,
+        distribution=args.distribution,
+        active_share=args.active_share,
+        owners=args.owners,
+        seed=args.seed,
+    )
+    print(f"Generated {args.users} users and {args.campaigns} campaigns in "
+          f"'{args.database}' in {time.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from app.database import engine, Base, SessionLocal
 from app.models import User, Campaign  # We must import all models here
 from app.schemas import UserCreate, CampaignCreate
 from app.crud import get_user_by_username, create_user, create_campaign
+from app.sharding import shard_router
 from datetime import date
 
 print("Connecting to database and creating tables...")
@@ -26,17 +27,19 @@ user = get_user_by_username(db, username="admin")
 if not user:
     print("Creating initial user 'admin'...")
     user_in = UserCreate(username="admin", password="password")
-    create_user(db=db, user=user_in)
+    user = create_user(db=db, user=user_in)
     print("User 'admin' created successfully.")
 else:
     print("User 'admin' already exists.")
 
 
 # --- Create Initial Campaigns ---
+# The seed campaigns belong to 'admin', on the shard holding its campaigns.
 # We check if campaigns already exist to avoid duplicates.
 # A simple check on the first campaign name is sufficient for this seed script.
 from app.crud import get_campaigns
-if not any(c.name == "Summer Sale 2025" for c in get_campaigns(db)):
+campaign_db = shard_router.open_shard(shard_router.shard_for(user.id))
+if not any(c.name == "Summer Sale 2025" for c in get_campaigns(campaign_db, owner_id=user.id)):
     print("Creating initial campaigns...")
     campaigns_to_create = [
         CampaignCreate(
@@ -58,13 +61,14 @@ if not any(c.name == "Summer Sale 2025" for c in get_campaigns(db)):
     ]
 
     for campaign_in in campaigns_to_create:
-        create_campaign(db=db, campaign=campaign_in)
+        create_campaign(db=campaign_db, owner_id=user.id, campaign=campaign_in)
 
     print(f"{len(campaigns_to_create)} campaigns created successfully.")
 else:
     print("Initial campaigns already exist.")
 
 
-# Close the session
+# Close the sessions
+campaign_db.close()
 db.close()
 print("Database initialization finished.")
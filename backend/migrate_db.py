@@ -0,0 +1,135 @@
+"""
+Upgrades a database created by an earlier version of the API to the current schema.
+
+create_all() (init_db.py, app startup) only creates missing tables: it never
+changes the tables an existing database already has. Run this once after
+upgrading, before starting the API:
+    python migrate_db.py                 # existing campaigns go to 'admin'
+    python migrate_db.py --owner alice
+
+Every step first checks what the database already has, so running it again is
+harmless. It migrates the main database (DATABASE_URL); shard files
+(CAMPAIGN_SHARD_DIR) are always created with the current schema.
+"""
+import argparse
+from typing import Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app import models  # We must import all models here
+from app.crud import CAMPAIGN_SYNC
+from app.database import Base, engine
+
+# Tables that got an 'owner_id' column when campaigns were scoped to their owner.
+OWNER_TABLES = ("campaigns", "campaigns_archive", "campaign_tombstones")
+
+
+def columns(conn: Connection, table: str) -> Set[str]:
+    return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+
+
+def owner_id_of(conn: Connection, username: str) -> int:
+    owner_id = conn.scalar(text("SELECT id FROM users WHERE username = :username"), {"username": username})
+    if owner_id is None:
+        raise SystemExit(f"No user '{username}' to own the existing campaigns: create it first or pass --owner.")
+    return owner_id
+
+
+def add_sync_versions(conn: Connection) -> None:
+    """
+    Delta sync: add 'campaigns.updated_version' and give every existing
+    campaign a version above 0, so that clients syncing from scratch
+    (since=0) receive them. 'sync_state' and 'campaign_tombstones' are new
+    tables, created by create_all().
+    """
+    if "updated_version" in columns(conn, "campaigns"):
+        return
+    conn.exec_driver_sql("ALTER TABLE campaigns ADD COLUMN updated_version INTEGER NOT NULL DEFAULT 0")
+    # Any increasing numbering will do: the ids are.
+    updated = conn.exec_driver_sql("UPDATE campaigns SET updated_version = id").rowcount
+    version = conn.scalar(text("SELECT COALESCE(MAX(id), 0) FROM campaigns"))
+    conn.execute(
+        text("INSERT OR REPLACE INTO sync_state (name, version, horizon) VALUES (:name, :version, 0)"),
+        {"name": CAMPAIGN_SYNC, "version": version},
+    )
+    print(f"Added campaigns.updated_version: {updated} campaigns versioned, sync version is {version}.")
+
+
+def add_owner_ids(conn: Connection, owner: str) -> None:
+    """
+    Campaigns belong to a user: add 'owner_id' and give every existing
+    campaign (live, archived or deleted) to 'owner'.
+    """
+    missing = [table for table in OWNER_TABLES if "owner_id" not in columns(conn, table)]
+    if not missing:
+        return
+    # The owner only has to exist when there are rows to give it.
+    has_rows = any(conn.exec_driver_sql(f"SELECT 1 FROM {table} LIMIT 1").first() for table in missing)
+    owner_id = owner_id_of(conn, owner) if has_rows else None
+    for table in missing:
+        # SQLite only adds a NOT NULL column with a default; no row keeps it.
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN owner_id INTEGER NOT NULL DEFAULT 0")
+        if owner_id is None:
+            print(f"Added {table}.owner_id.")
+            continue
+        updated = conn.execute(text(f"UPDATE {table} SET owner_id = :owner_id"), {"owner_id": owner_id}).rowcount
+        print(f"Added {table}.owner_id: {updated} rows now belong to '{owner}'.")
+    # Superseded by ix_campaigns_owner_id_updated_version.
+    conn.exec_driver_sql("DROP INDEX IF EXISTS ix_campaigns_updated_version")
+
+
+def rebuild_with_autoincrement(conn: Connection) -> None:
+    """
+    Tombstones need campaign ids that are never reused (AUTOINCREMENT), which
+    SQLite cannot add to an existing table: copy 'campaigns' into a new table,
+    then rebuild its search index.
+    """
+    sql = conn.scalar(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'campaigns'"))
+    if "AUTOINCREMENT" in sql.upper():
+        return
+    # The old table's indexes and triggers would follow it through the rename.
+    for (trigger,) in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'campaigns'").all():
+        conn.exec_driver_sql(f"DROP TRIGGER {trigger}")
+    for (index,) in conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'campaigns' AND sql IS NOT NULL").all():
+        conn.exec_driver_sql(f"DROP INDEX {index}")
+    conn.exec_driver_sql("ALTER TABLE campaigns RENAME TO campaigns_old")
+    models.Campaign.__table__.create(conn)  # with the search index triggers
+    names = ", ".join(column.name for column in models.Campaign.__table__.columns)
+    copied = conn.exec_driver_sql(f"INSERT INTO campaigns ({names}) SELECT {names} FROM campaigns_old").rowcount
+    conn.exec_driver_sql("DROP TABLE campaigns_old")
+    conn.exec_driver_sql(
+        f"INSERT INTO {models.CAMPAIGN_SEARCH_TABLE}({models.CAMPAIGN_SEARCH_TABLE}) VALUES ('rebuild')"
+    )
+    print(f"Rebuilt campaigns with AUTOINCREMENT ids: {copied} campaigns copied, search index rebuilt.")
+
+
+def create_indexes(conn: Connection) -> None:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def migrate(bind: Engine, owner: str = "admin") -> None:
+    with bind.begin() as conn:
+        Base.metadata.create_all(bind=conn)  # tables added since the database was created
+        add_sync_versions(conn)
+        add_owner_ids(conn, owner)
+        rebuild_with_autoincrement(conn)  # once every column exists
+        create_indexes(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upgrade the database to the current schema.")
+    parser.add_argument("--owner", default="admin", help="User who owns the campaigns created before owners existed")
+    args = parser.parse_args()
+
+    print("Connecting to database...")
+    migrate(engine, args.owner)
+    print("Database is up to date.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Shard rebalancing for file-sharded campaigns (see app/sharding.py).
+
+Shows how campaigns are spread over the shards, adds shards and moves owners
+between them, one owner at a time: its campaigns, archive and tombstones are
+copied to the target shard, the owner is pinned there in placements.json
+(servers pick the change up on their next request), then the source copy is
+deleted. Stop the API, or at least the owners' writes, while moving: a write
+landing on the source shard during the copy would be lost.
+
+When sharding is turned on for an existing deployment, the campaigns created
+so far are still in the main database, where the file-sharded API no longer
+looks: --from-main moves them to their owners' shards (run it before
+starting the API with CAMPAIGN_SHARD_DIR).
+
+Usage (from the backend/ directory):
+    python rebalance_shards.py shards/ --status
+    python rebalance_shards.py shards/ --from-main
+    python rebalance_shards.py shards/ --add-shards 2 --auto
+    python rebalance_shards.py shards/ --move 42:shard-3
+"""
+import argparse
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func, select, union_all
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.database import SessionLocal
+from app.sharding import FileShardRouter
+
+
+def owner_sizes(db: Session) -> Dict[int, int]:
+    """
+    Number of campaigns (live and archived) per owner in one database.
+    """
+    owners = union_all(*(
+        select(table.c.owner_id)
+        for table in (models.Campaign.__table__, models.ArchivedCampaign.__table__)
+    )).subquery()
+    return dict(db.execute(select(owners.c.owner_id, func.count()).group_by(owners.c.owner_id)).all())
+
+
+def shard_sizes(router: FileShardRouter) -> Dict[str, Dict[int, int]]:
+    """
+    Number of campaigns (live and archived) per owner, for every shard.
+    """
+    sizes = {}
+    for shard in router.shards():
+        with router.open_shard(shard) as db:
+            sizes[shard] = owner_sizes(db)
+    return sizes
+
+
+def plan_rebalance(sizes: Dict[str, Dict[int, int]], tolerance: float = 0.1) -> List[Tuple[int, str, str]]:
+    """
+    Greedy plan of (owner, source, target) moves evening out the campaign count
+    of the shards, until the largest and smallest shard differ by at most
+    'tolerance' of the mean. Each move takes the largest owner of the fullest
+    shard that still narrows the gap to the emptiest one.
+    """
+    sizes = {shard: dict(owners) for shard, owners in sizes.items()}
+    totals = {shard: sum(owners.values()) for shard, owners in sizes.items()}
+    mean = sum(totals.values()) / len(totals)
+    moves = []
+    while True:
+        fullest = max(totals, key=totals.get)
+        emptiest = min(totals, key=totals.get)
+        gap = totals[fullest] - totals[emptiest]
+        if gap <= tolerance * mean:
+            break
+        # Moving 'count' campaigns narrows the gap as long as count < gap; count <= gap / 2 never overshoots.
+        candidates = [(count, owner) for owner, count in sizes[fullest].items() if count < gap]
+        if not candidates:
+            break
+        count, owner = max(candidates, key=lambda candidate: (candidate[0] <= gap / 2, candidate[0]))
+        del sizes[fullest][owner]
+        sizes[emptiest][owner] = count
+        totals[fullest] -= count
+        totals[emptiest] += count
+        moves.append((owner, fullest, emptiest))
+    return moves
+
+
+def move_owner(router: FileShardRouter, owner_id: int, target: str) -> int:
+    """
+    Move the campaigns of 'owner_id' to the 'target' shard and route the owner there.
+    Returns the number of campaigns moved.
+    """
+    source = router.shard_for(owner_id)
+    if source == target:
+        return 0
+    with router.open_shard(source) as source_db, router.open_shard(target) as target_db:
+        moved = crud.copy_owner_campaigns(source_db, target_db, owner_id)
+        router.place(owner_id, target)
+        crud.delete_owner_campaigns(source_db, owner_id)
+    return moved
+
+
+def move_from_main(router: FileShardRouter, main_db: Session) -> Dict[int, int]:
+    """
+    Move every owner's campaigns still in the main database to the owner's shard.
+    Their ids are kept: main database ids are below 2**40, so they never collide
+    with a shard's id block (see sharding.SHARD_ID_BITS).
+    Returns the number of campaigns moved per owner.
+    """
+    owners = set(owner_sizes(main_db))
+    tombstones = models.CampaignTombstone.__table__
+    owners.update(main_db.scalars(select(tombstones.c.owner_id).distinct()))
+
+    moved = {}
+    for owner_id in sorted(owners):
+        with router.open_shard(router.shard_for(owner_id)) as shard_db:
+            moved[owner_id] = crud.copy_owner_campaigns(main_db, shard_db, owner_id)
+        crud.delete_owner_campaigns(main_db, owner_id)
+    return moved
+
+
+def print_status(sizes: Dict[str, Dict[int, int]]) -> None:
+    print(f"{'shard':<12}{'owners':>8}{'campaigns':>12}{'largest owner':>16}")
+    for shard, owners in sizes.items():
+        largest = max(owners.items(), key=lambda item: item[1]) if owners else None
+        print(f"{shard:<12}{len(owners):>8}{sum(owners.values()):>12}"
+              f"{f'{largest[0]} ({largest[1]})' if largest else '-':>16}")
+
+
+def parse_move(value: str) -> Tuple[int, str]:
+    owner, _, shard = value.partition(":")
+    try:
+        return int(owner), shard
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected OWNER_ID:SHARD, e.g. 42:shard-3")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and rebalance campaign shards.")
+    parser.add_argument("shard_dir", help="Shard directory (CAMPAIGN_SHARD_DIR of the API)")
+    parser.add_argument("--status", action="store_true", help="Show campaigns per shard")
+    parser.add_argument("--from-main", action="store_true",
+                        help="First move the campaigns still in the main database (DATABASE_URL) to their owners' shards")
+    parser.add_argument("--add-shards", type=int, default=0, help="Create this many new, empty shards first")
+    parser.add_argument("--move", type=parse_move, action="append", default=[], metavar="OWNER:SHARD",
+                        help="Move an owner to a shard (repeatable)")
+    parser.add_argument("--auto", action="store_true", help="Move owners until the shards are balanced")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="--auto stops when shards differ by at most this share of the mean (default: 0.1)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the moves without doing them")
+    args = parser.parse_args()
+
+    router = FileShardRouter(args.shard_dir)
+    try:
+        if args.from_main:
+            with SessionLocal() as main_db:
+                moved = move_from_main(router, main_db)
+            for owner, count in moved.items():
+                print(f"Moved owner {owner}: main -> {router.shard_for(owner)} ({count} campaigns)")
+
+        if args.add_shards:
+            print(f"Added shards: {', '.join(router.add_shards(args.add_shards))}")
+
+        moves = [(owner, router.shard_for(owner), shard) for owner, shard in args.move]
+        if args.auto:
+            moves += plan_rebalance(shard_sizes(router), args.tolerance)
+
+        for owner, source, target in moves:
+            if args.dry_run:
+                print(f"Would move owner {owner}: {source} -> {target}")
+            else:
+                print(f"Moved owner {owner}: {source} -> {target} ({move_owner(router, owner, target)} campaigns)")
+
+        if args.status or not moves:
+            print_status(shard_sizes(router))
+    finally:
+        router.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+from app.database import engine, Base
+from app import models  # We must import all models here
+from app.crud import rebuild_campaign_search_index
+from app.sharding import shard_router
+
+# Rebuilds the campaign full-text search index (SQLite FTS5).
+# New databases get the index and its triggers from create_all(); run this
+# once on databases created before the index existed, or to repair it.
+# With file shards (CAMPAIGN_SHARD_DIR), the index of every shard is rebuilt.
+
+print("Connecting to database...")
+Base.metadata.create_all(bind=engine)
+
+for shard in shard_router.shards():
+    db = shard_router.open_shard(shard)
+    try:
+        print(f"[{shard}] Rebuilding campaign search index...")
+        rebuild_campaign_search_index(db)
+        count = db.query(models.Campaign).count()
+        print(f"[{shard}] Search index rebuilt for {count} campaigns.")
+    finally:
+        db.close()
@@ -4,7 +4,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
-from app.main import app
+from app.main import admission, app
 from app.database import Base
 from app.dependencies import get_db
 
@@ -52,6 +52,7 @@ def client(test_db: Session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    admission.reset()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -83,3 +84,23 @@ def auth_headers(client: TestClient, test_user):
     assert response.status_code == 200, f"Auth failed: {response.text}"
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="function")
+def create_campaign(client: TestClient, auth_headers: dict):
+    """
+    Factory creating a campaign through the API and returning its id.
+    Any field can be overridden; 'headers' creates it as another user.
+    """
+    def create(name: str = "Campaign", headers: dict = None, **fields) -> int:
+        response = client.post("/campaigns/", headers=headers or auth_headers, json={
+            "name": name,
+            "start_date": "2025-01-01",
+            "end_date": "2025-01-31",
+            "budget": 1000.0,
+            **fields,
+        })
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    return create
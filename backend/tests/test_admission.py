@@ -0,0 +1,208 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app import crud, metrics, schemas
+from app.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionPolicy,
+    ConcurrencyLimiter,
+    Rejected,
+    RouteLimit,
+    TokenBucket,
+)
+from app.main import admission, app
+from app.routers.campaigns import read_flight
+
+# client, test_db, test_user and auth_headers fixtures are provided by conftest.py
+
+
+def test_token_bucket():
+    """
+    The bucket allows a burst, then asks the caller to wait for a refill.
+    """
+    bucket = TokenBucket(rate=1.0, burst=2)
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert 0 < bucket.take() <= 1.0
+
+
+def test_concurrency_limiter_queue_and_deadline():
+    """
+    Over the limit, requests queue up to max_queue, then are rejected; a
+    queued request gets the slot of a finishing one or gives up at its deadline.
+    """
+    async def scenario():
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1, max_wait=1.0)
+        await limiter.acquire(time.monotonic() + 1)
+
+        queued = asyncio.ensure_future(limiter.acquire(time.monotonic() + 1))
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        with pytest.raises(Rejected) as rejected:
+            await limiter.acquire(time.monotonic() + 1)
+        assert rejected.value.reason == "queue_full"
+
+        limiter.release(0.01)
+        await queued
+        assert limiter.active == 1 and limiter.waiting == 0
+
+        with pytest.raises(Rejected) as rejected:
+            await limiter.acquire(time.monotonic() + 0.01)
+        assert rejected.value.reason == "deadline"
+        assert limiter.waiting == 0
+
+        limiter.release(0.01)
+        assert limiter.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_route_limit_sheds_load():
+    """
+    Concurrent requests beyond the route limit and its queue get 503 with Retry-After.
+    """
+    async def slow(request):
+        await asyncio.sleep(0.05)
+        return PlainTextResponse("done")
+
+    controller = AdmissionController(AdmissionPolicy(
+        routes=(RouteLimit("GET", "/slow", max_concurrent=1, max_queue=1, max_wait=1.0),),
+    ))
+    app = Starlette(
+        routes=[Route("/slow", slow)],
+        middleware=[Middleware(AdmissionMiddleware, controller=controller)],
+    )
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/slow") for _ in range(3)))
+
+    responses = asyncio.run(burst())
+    assert sorted(r.status_code for r in responses) == [200, 200, 503]
+    rejected = next(r for r in responses if r.status_code == 503)
+    assert int(rejected.headers["retry-after"]) >= 1
+
+
+def test_route_max_wait_beyond_user_max_wait():
+    """
+    A request queued on a route waits up to the route's max_wait, even when
+    it is longer than the per-user max_wait.
+    """
+    async def slow(request):
+        await asyncio.sleep(0.3)
+        return PlainTextResponse("done")
+
+    controller = AdmissionController(AdmissionPolicy(
+        routes=(RouteLimit("GET", "/slow", max_concurrent=1, max_queue=1, max_wait=2.0),),
+        user_max_wait=0.1,
+    ))
+    app = Starlette(
+        routes=[Route("/slow", slow)],
+        middleware=[Middleware(AdmissionMiddleware, controller=controller)],
+    )
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/slow") for _ in range(2)))
+
+    assert [r.status_code for r in asyncio.run(burst())] == [200, 200]
+
+
+def test_coalesced_followers_are_capped_per_user():
+    """
+    Identical requests join an admitted one without a slot only up to
+    user_max_coalesced; the rest go through the user's limits as usual.
+    """
+    async def slow(request):
+        await asyncio.sleep(0.1)
+        return PlainTextResponse("done")
+
+    controller = AdmissionController(AdmissionPolicy(
+        coalesced_paths=("/slow",), user_max_coalesced=2, user_max_concurrent=1, user_max_queue=0,
+    ))
+    app = Starlette(
+        routes=[Route("/slow", slow)],
+        middleware=[Middleware(AdmissionMiddleware, controller=controller)],
+    )
+    metrics.reset()
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/slow") for _ in range(5)))
+
+    assert sorted(r.status_code for r in asyncio.run(burst())) == [200, 200, 200, 429, 429]
+    assert metrics.value("admission.other.coalesced") == 2
+    assert controller.followers == {} and controller.in_flight == {}
+
+
+def test_user_rate_limit(client: TestClient, auth_headers: dict, monkeypatch):
+    """
+    A user over their token bucket gets 429 with Retry-After, and it is counted.
+    """
+    monkeypatch.setattr(admission, "policy", AdmissionPolicy(user_rate=0.1, user_burst=2))
+    admission.reset()
+    metrics.reset()
+
+    statuses = [client.get("/campaigns/", headers=auth_headers).status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+    response = client.get("/campaigns/", headers=auth_headers)
+    assert int(response.headers["retry-after"]) >= 1
+    assert metrics.value("admission.rate_limited") == 2
+
+
+def test_same_user_burst_of_identical_reads_is_coalesced(
+        client: TestClient, test_db: Session, test_user, auth_headers: dict
+):
+    """
+    A dashboard burst of identical list requests from one user, well over the
+    user and route limits, is admitted in full and served by a single query.
+    """
+    burst = 30
+    crud.create_campaign(test_db, test_user.id, schemas.CampaignCreate(
+        name="Dashboard", start_date="2025-01-01", end_date="2025-01-31", budget=10.0,
+    ))
+    metrics.reset()
+    key = ("/campaigns/", (("limit", "500"), ("skip", "0")), test_user.id)
+
+    queries = []
+    def listener(conn, cursor, statement, *args):
+        if "FROM campaigns" in statement:
+            deadline = time.monotonic() + 5
+            while read_flight.waiters(key) < burst - 1 and time.monotonic() < deadline:
+                time.sleep(0.001)  # hold the leader until the whole burst has joined it
+            queries.append(statement)
+
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=auth_headers) as http:
+            return await asyncio.gather(*(
+                http.get("/campaigns/", params={"skip": 0, "limit": 500}) for _ in range(burst)
+            ))
+
+    engine = test_db.get_bind()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        responses = asyncio.run(send())
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert [response.status_code for response in responses] == [200] * burst
+    assert len(queries) == 1
+    assert metrics.value("admission.GET /campaigns/.admitted") == 1
+    assert metrics.value("admission.GET /campaigns/.coalesced") == burst - 1
+    assert read_flight.collect()["campaigns.read.coalesce_ratio"] == pytest.approx((burst - 1) / burst)
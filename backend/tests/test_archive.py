@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import crud
+
+# client, test_db, auth_headers and create_campaign fixtures are provided by conftest.py
+
+
+def _ending(end_date: date) -> dict:
+    return {"start_date": (end_date - timedelta(days=30)).isoformat(), "end_date": end_date.isoformat()}
+
+
+def test_archive_moves_finished_campaigns(
+        client: TestClient, auth_headers: dict, test_db: Session, create_campaign
+):
+    """
+    Campaigns finished before the cutoff leave the live list, in batches,
+    and are only returned with include_archived=true.
+    """
+    today = date.today()
+    old = [create_campaign(f"Old {i}", **_ending(today - timedelta(days=200 + i))) for i in range(3)]
+    recent = create_campaign("Recent", **_ending(today - timedelta(days=10)))
+    running = create_campaign("Running", **_ending(today + timedelta(days=10)))
+    since = client.get("/campaigns/changes", headers=auth_headers).json()["version"]
+
+    assert crud.archive_finished_campaigns(test_db, older_than=timedelta(days=90), batch_size=2) == 3
+
+    live = client.get("/campaigns/", headers=auth_headers).json()
+    assert [c["id"] for c in live] == [recent, running]
+
+    everything = client.get("/campaigns/", params={"include_archived": "true"}, headers=auth_headers).json()
+    assert [c["id"] for c in everything] == sorted(old + [recent, running])
+    assert everything[0]["name"] == "Old 0"
+
+    page = client.get(
+        "/campaigns/", params={"include_archived": "true", "fields": "name", "skip": 1, "limit": 2},
+        headers=auth_headers,
+    ).json()
+    assert page == [{"id": old[1], "name": "Old 1"}, {"id": old[2], "name": "Old 2"}]
+
+    assert client.get(f"/campaigns/{old[0]}", headers=auth_headers).status_code == 404
+    archived = client.get(f"/campaigns/{old[0]}", params={"include_archived": "true"}, headers=auth_headers)
+    assert archived.status_code == 200
+    assert archived.json()["name"] == "Old 0"
+
+    changes = client.get("/campaigns/changes", params={"since": since}, headers=auth_headers).json()
+    assert sorted(changes["deleted"]) == old
+
+
+def test_archive_nothing_to_do(test_db: Session):
+    """
+    The job is a no-op when no campaign is old enough.
+    """
+    assert crud.archive_finished_campaigns(test_db, older_than=timedelta(days=90)) == 0
@@ -2,7 +2,7 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-# client, test_db, and auth_headers fixtures are provided by conftest.py
+# client, test_db, auth_headers and create_campaign fixtures are provided by conftest.py
 
 
 def test_create_campaign_unauthenticated(client: TestClient):
@@ -298,3 +298,53 @@ def test_authentication_invalid_credentials(client: TestClient):
         data={"username": "wronguser", "password": "wrongpass"}
     )
     assert response.status_code == 401
+
+
+def test_read_campaigns_by_ids(client: TestClient, auth_headers: dict, create_campaign):
+    """
+    Test fetching specific campaigns with ids=.
+    Should return only those campaigns, ordered by id, ignoring unknown ids.
+    """
+    ids = [create_campaign(f"Multi Get {i}", budget=100.0 * (i + 1)) for i in range(3)]
+
+    response = client.get(f"/campaigns/?ids={ids[2]},{ids[0]},99999", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [c["id"] for c in data] == [ids[0], ids[2]]
+    assert set(data[0]) == {"id", "name", "description", "start_date", "end_date", "budget", "status"}
+
+    response = client.get("/campaigns/?ids=1,abc", headers=auth_headers)
+    assert response.status_code == 422
+    for out_of_range in ("0", "-1", str(2**63)):
+        response = client.get(f"/campaigns/?ids=1,{out_of_range}", headers=auth_headers)
+        assert response.status_code == 422
+
+
+def test_read_campaigns_sparse_fields(client: TestClient, auth_headers: dict, create_campaign):
+    """
+    Test selecting a subset of fields with fields=.
+    Should return only the requested fields plus the id.
+    """
+    campaign_id = create_campaign(
+        "Sparse Campaign", description="A long description that list views don't need", budget=999.0
+    )
+
+    response = client.get("/campaigns/?fields=name,budget", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == [{"id": campaign_id, "name": "Sparse Campaign", "budget": 999.0}]
+
+    response = client.get("/campaigns/?fields=name,password", headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_sparse_pages_match_full_pages(client: TestClient, auth_headers: dict, create_campaign):
+    """
+    Pages with fields= hold the same campaigns, in the same id order, as full pages.
+    """
+    ids = [create_campaign(name) for name in ("Zulu", "Alpha", "Mike", "Bravo", "Yankee")]
+
+    for skip in (0, 2, 4):
+        params = {"skip": skip, "limit": 2}
+        full = client.get("/campaigns/", params=params, headers=auth_headers).json()
+        sparse = client.get("/campaigns/", params={**params, "fields": "name"}, headers=auth_headers).json()
+        assert [c["id"] for c in sparse] == [c["id"] for c in full] == ids[skip:skip + 2]
@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, metrics, schemas
+from app.coalescing import SingleFlight
+from app.main import app
+from app.routers.campaigns import read_flight
+
+# client, test_db, test_user and auth_headers fixtures are provided by conftest.py
+
+BURST = 8
+
+
+def _burst(flight: SingleFlight, key, fn):
+    """
+    Call flight.do(key, fn) BURST times at once; return results and errors.
+    """
+    async def burst():
+        return await asyncio.gather(*(flight.do(key, fn) for _ in range(BURST)), return_exceptions=True)
+
+    outcomes = asyncio.run(burst())
+    return ([o for o in outcomes if not isinstance(o, BaseException)],
+            [o for o in outcomes if isinstance(o, BaseException)])
+
+
+def _wait_for_followers(flight: SingleFlight, key):
+    """
+    Hold the leader until every other request of the burst has joined its call.
+    """
+    deadline = time.monotonic() + 5
+    while flight.waiters(key) < BURST - 1:
+        assert time.monotonic() < deadline, "followers never joined the in-flight call"
+        time.sleep(0.001)
+
+
+def test_burst_runs_one_query(client: TestClient, test_db: Session, test_user, auth_headers: dict):
+    """
+    Identical concurrent GET /campaigns/ requests run a single DB query and
+    share the same response body.
+    """
+    crud.create_campaign(test_db, test_user.id, schemas.CampaignCreate(
+        name="Dashboard", start_date="2025-01-01", end_date="2025-01-31", budget=10.0,
+    ))
+    metrics.reset()
+    key = ("/campaigns/", (("limit", "100"),), test_user.id)
+
+    queries = []
+    def listener(conn, cursor, statement, *args):
+        if "FROM campaigns" in statement:
+            _wait_for_followers(read_flight, key)  # runs in the leader's worker thread
+            queries.append(statement)
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=auth_headers) as http:
+            return await asyncio.gather(*(http.get("/campaigns/", params={"limit": 100}) for _ in range(BURST)))
+
+    engine = test_db.get_bind()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        responses = asyncio.run(burst())
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert [response.status_code for response in responses] == [200] * BURST
+    assert all(response.content == responses[0].content for response in responses)
+    assert [c["name"] for c in responses[0].json()] == ["Dashboard"]
+    assert len(queries) == 1
+    assert metrics.value("campaigns.read.executed") == 1
+    assert metrics.value("campaigns.read.coalesced") == BURST - 1
+    assert read_flight.collect()["campaigns.read.coalesce_ratio"] == pytest.approx((BURST - 1) / BURST)
+
+
+def test_burst_shares_errors():
+    """
+    An error in the shared computation is raised in every caller, and the next call runs again.
+    """
+    flight, key = SingleFlight("test.error"), "key"
+
+    def compute():
+        _wait_for_followers(flight, key)
+        raise LookupError("not found")
+
+    results, errors = _burst(flight, key, compute)
+    assert len(errors) == BURST
+    assert all(isinstance(error, LookupError) for error in errors)
+    assert asyncio.run(flight.do(key, lambda: b"fresh")) == b"fresh"
+
+
+def test_metrics_endpoint_reports_coalescing(client: TestClient, auth_headers: dict):
+    """
+    Read endpoints go through the coalescer and its counters are exported.
+    """
+    metrics.reset()
+    client.get("/campaigns/", headers=auth_headers)
+    client.get("/campaigns/", headers=auth_headers)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["campaigns.read.executed"] == 2
+    assert data["campaigns.read.coalesce_ratio"] == 0.0
@@ -0,0 +1,56 @@
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.compression import choose_encoding
+
+# client, auth_headers and create_campaign fixtures are provided by conftest.py
+
+DESCRIPTION = "Remote dashboards load this list over slow links."
+
+
+def test_choose_encoding():
+    """
+    q-values are honoured and unsupported or refused encodings are skipped.
+    """
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("") is None
+
+
+def test_large_list_is_gzipped_and_cached(client: TestClient, auth_headers: dict, create_campaign):
+    """
+    A large list is compressed, and a repeated identical response comes from the cache.
+    """
+    for i in range(20):
+        create_campaign(f"Compressed Campaign {i}", description=DESCRIPTION)
+    metrics.reset()
+    headers = {**auth_headers, "Accept-Encoding": "gzip"}
+
+    first = client.get("/campaigns/", headers=headers)
+    second = client.get("/campaigns/", headers=headers)
+
+    assert first.status_code == 200
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert len(first.json()) == 20
+    assert second.json() == first.json()
+    assert metrics.value("compression.cache_misses") == 1
+    assert metrics.value("compression.cache_hits") == 1
+    assert metrics.value("compression.bytes_out") < metrics.value("compression.bytes_in")
+
+
+def test_small_or_unnegotiated_responses_are_not_compressed(
+        client: TestClient, auth_headers: dict, create_campaign
+):
+    """
+    Bodies under the threshold, or without Accept-Encoding, are sent as is.
+    """
+    small = client.get("/campaigns/", headers={**auth_headers, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    for i in range(20):
+        create_campaign(f"Compressed Campaign {i}", description=DESCRIPTION)
+    plain = client.get("/campaigns/", headers={**auth_headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert len(plain.content) == int(plain.headers["content-length"])
@@ -0,0 +1,41 @@
+from datetime import date
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+import generate_dataset
+from app import crud, models, schemas
+from app.dependencies import verify_password
+
+
+def test_generate_dataset(tmp_path):
+    """
+    The generator fills users and campaigns, keeps the sync counter and the
+    search index consistent, and leaves the database in WAL mode.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'dataset.db'}")
+    generate_dataset.generate(engine, campaigns=250, users=3, first_start=date(2025, 1, 1),
+                              last_start=date(2025, 12, 31), seed=1)
+    db = sessionmaker(bind=engine)()
+    try:
+        assert db.scalar(select(func.count()).select_from(models.Campaign)) == 250
+        user = crud.get_user_by_username(db, "user3")
+        assert user is not None and verify_password("password123", user.hashed_password)
+
+        state = crud.get_sync_state(db)
+        assert state.version == db.scalar(select(func.max(models.Campaign.updated_version))) == 250
+
+        campaign = db.get(models.Campaign, 42)
+        assert date(2025, 1, 1) <= campaign.start_date <= date(2025, 12, 31)
+        assert campaign.start_date < campaign.end_date
+        assert 42 in [row.id for row in crud.search_campaigns(db, campaign.owner_id, campaign.name, limit=250)]
+
+        # The triggers are back: a new campaign is searchable right away.
+        created = crud.create_campaign(db, campaign.owner_id, schemas.CampaignCreate(
+            name="Zeppelin launch", start_date=date(2026, 1, 1), end_date=date(2026, 2, 1), budget=1.0,
+        ))
+        assert [row.id for row in crud.search_campaigns(db, campaign.owner_id, "zeppelin")] == [created.id]
+        assert db.connection().exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+    finally:
+        db.close()
+        engine.dispose()
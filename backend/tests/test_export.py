@@ -0,0 +1,71 @@
+import io
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import crud, export
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+# client, test_db, auth_headers and create_campaign fixtures are provided by conftest.py
+
+
+@pytest.fixture
+def campaigns(create_campaign):
+    """
+    Three campaigns: one long finished (archivable), one without description, one inactive.
+    """
+    for i, end_date in enumerate(["2020-01-31", "2099-01-31", "2099-02-28"]):
+        create_campaign(
+            f"Export {i}",
+            description=None if i == 1 else f"Description {i}",
+            start_date="2020-01-01",
+            end_date=end_date,
+            budget=100.5 * (i + 1),
+            status=i != 2,
+        )
+
+
+def test_export_arrow_stream(client: TestClient, auth_headers: dict, campaigns):
+    """
+    The Arrow export contains every campaign with typed columns.
+    """
+    response = client.get("/campaigns/export", params={"format": "arrow"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.schema == export.campaign_schema()
+    assert table.column("name").to_pylist() == ["Export 0", "Export 1", "Export 2"]
+    assert table.column("description").to_pylist() == ["Description 0", None, "Description 2"]
+    assert table.column("status").to_pylist() == [True, True, False]
+    assert str(table.column("end_date")[1]) == "2099-01-31"
+
+
+def test_export_parquet_in_batches_with_archive(
+        client: TestClient, auth_headers: dict, test_db: Session, campaigns
+):
+    """
+    Small batches give several row groups; archived campaigns are exported on request.
+    """
+    crud.archive_finished_campaigns(test_db, older_than=timedelta(days=90))
+
+    assert [b.num_rows for b in export.iter_campaign_batches(test_db, batch_size=1)] == [1, 1]
+
+    live = client.get("/campaigns/export", headers=auth_headers)
+    assert pq.read_table(io.BytesIO(live.content)).num_rows == 2
+
+    everything = client.get("/campaigns/export", params={"include_archived": "true"}, headers=auth_headers)
+    table = pq.read_table(io.BytesIO(everything.content))
+    assert sorted(table.column("name").to_pylist()) == ["Export 0", "Export 1", "Export 2"]
+
+
+def test_export_rejects_unknown_format(client: TestClient, auth_headers: dict):
+    """
+    Only arrow and parquet are accepted.
+    """
+    response = client.get("/campaigns/export", params={"format": "csv"}, headers=auth_headers)
+    assert response.status_code == 422
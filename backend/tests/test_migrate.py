@@ -0,0 +1,168 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import migrate_db
+from app import crud, models, schemas
+from app.dependencies import get_db
+from app.main import app
+
+# client fixture is provided by conftest.py
+
+# Schema of a database created before delta sync (and search), as shipped originally.
+UNVERSIONED_SCHEMA = [
+    """
+    CREATE TABLE users (
+        id INTEGER NOT NULL PRIMARY KEY, username VARCHAR NOT NULL UNIQUE, hashed_password VARCHAR NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE campaigns (
+        id INTEGER NOT NULL PRIMARY KEY, name VARCHAR NOT NULL, description VARCHAR,
+        start_date DATE NOT NULL, end_date DATE NOT NULL, budget FLOAT NOT NULL, status BOOLEAN
+    )
+    """,
+    "CREATE INDEX ix_campaigns_name ON campaigns (name)",
+    "CREATE INDEX ix_campaigns_id ON campaigns (id)",
+    """
+    INSERT INTO campaigns (name, description, start_date, end_date, budget, status) VALUES
+    ('Summer Sale', 'Old campaign', '2025-06-01', '2025-08-31', 5000.0, 1),
+    ('Black Friday', 'Old campaign', '2025-11-20', '2025-11-30', 15000.0, 1)
+    """,
+]
+
+# Schema of a database created before campaigns had an owner.
+UNOWNED_SCHEMA = [
+    """
+    CREATE TABLE users (
+        id INTEGER NOT NULL PRIMARY KEY, username VARCHAR NOT NULL UNIQUE, hashed_password VARCHAR NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE campaigns (
+        id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, name VARCHAR NOT NULL, description VARCHAR,
+        start_date DATE NOT NULL, end_date DATE NOT NULL, budget FLOAT NOT NULL, status BOOLEAN,
+        updated_version INTEGER DEFAULT '0' NOT NULL
+    )
+    """,
+    "CREATE INDEX ix_campaigns_updated_version ON campaigns (updated_version)",
+    """
+    CREATE TABLE campaigns_archive (
+        id INTEGER NOT NULL PRIMARY KEY, name VARCHAR NOT NULL, description VARCHAR,
+        start_date DATE NOT NULL, end_date DATE NOT NULL, budget FLOAT NOT NULL, status BOOLEAN,
+        updated_version INTEGER DEFAULT '0' NOT NULL, archived_at DATETIME NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE campaign_tombstones (
+        campaign_id INTEGER NOT NULL PRIMARY KEY, deleted_version INTEGER NOT NULL, deleted_at DATETIME NOT NULL
+    )
+    """,
+    "CREATE TABLE sync_state (name VARCHAR NOT NULL PRIMARY KEY, version INTEGER NOT NULL, horizon INTEGER NOT NULL)",
+    *models.CAMPAIGN_SEARCH_DDL,
+    """
+    INSERT INTO campaigns (name, description, start_date, end_date, budget, status, updated_version)
+    VALUES ('Summer Sale', 'Old campaign', '2025-06-01', '2025-08-31', 5000.0, 1, 1)
+    """,
+    "INSERT INTO campaign_tombstones VALUES (7, 2, '2025-01-01 00:00:00')",
+    "INSERT INTO sync_state VALUES ('campaigns', 2, 0)",
+]
+
+
+@pytest.fixture
+def make_database(tmp_path):
+    engines = []
+
+    def make(schema):
+        path = tmp_path / f"old-{len(engines)}.db"
+        with sqlite3.connect(path) as conn:
+            for statement in schema:
+                conn.execute(statement)
+        engines.append(create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}))
+        return engines[-1]
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def old_database(make_database):
+    return make_database(UNOWNED_SCHEMA)
+
+
+def _login(client: TestClient, engine) -> dict:
+    db = sessionmaker(bind=engine)()
+    app.dependency_overrides[get_db] = lambda: db
+    token = client.post("/auth/token", data={"username": "admin", "password": "secret"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_migrate_adds_sync_versions(client: TestClient, make_database):
+    """
+    An original database gets versioned campaigns (all returned to a client
+    syncing from scratch), never reused ids and a search index.
+    """
+    engine = make_database(UNVERSIONED_SCHEMA)
+    with sessionmaker(bind=engine)() as db:
+        crud.create_user(db, schemas.UserCreate(username="admin", password="secret"))
+    migrate_db.migrate(engine, "admin")
+    migrate_db.migrate(engine, "admin")
+    headers = _login(client, engine)
+
+    changes = client.get("/campaigns/changes", headers=headers).json()
+    assert [c["name"] for c in changes["changed"]] == ["Summer Sale", "Black Friday"]
+    assert changes["version"] == 2
+    assert [c["name"] for c in client.get("/campaigns/search", headers=headers, params={"q": "friday"}).json()] == ["Black Friday"]
+
+    assert client.delete("/campaigns/2", headers=headers).status_code == 200
+    created = client.post("/campaigns/", headers=headers, json={
+        "name": "New", "start_date": "2025-01-01", "end_date": "2025-01-31", "budget": 1.0,
+    }).json()
+    assert created["id"] == 3  # not the deleted campaign's id
+    changes = client.get("/campaigns/changes", headers=headers, params={"since": 2}).json()
+    assert ([c["id"] for c in changes["changed"]], changes["deleted"]) == ([3], [2])
+
+
+def test_migrate_gives_existing_campaigns_an_owner(client: TestClient, old_database):
+    """
+    After the migration the API serves an old database: its campaigns, their
+    search index and sync history belong to the chosen owner.
+    """
+    with sessionmaker(bind=old_database)() as db:
+        crud.create_user(db, schemas.UserCreate(username="admin", password="secret"))
+    migrate_db.migrate(old_database, "admin")
+    migrate_db.migrate(old_database, "admin")  # a second run changes nothing
+    headers = _login(client, old_database)
+
+    assert [c["name"] for c in client.get("/campaigns/", headers=headers).json()] == ["Summer Sale"]
+    assert [c["name"] for c in client.get("/campaigns/search", headers=headers, params={"q": "summer"}).json()] == ["Summer Sale"]
+    changes = client.get("/campaigns/changes", headers=headers).json()
+    assert (len(changes["changed"]), changes["deleted"]) == (1, [7])
+    assert client.post("/campaigns/", headers=headers, json={
+        "name": "New", "start_date": "2025-01-01", "end_date": "2025-01-31", "budget": 1.0,
+    }).status_code == 201
+
+    with old_database.connect() as conn:
+        indexes = {row[1] for row in conn.exec_driver_sql("PRAGMA index_list(campaigns)")}
+    assert "ix_campaigns_owner_id_updated_version" in indexes
+    assert "ix_campaigns_updated_version" not in indexes
+
+
+def test_migrate_needs_the_owner(old_database):
+    with pytest.raises(SystemExit):
+        migrate_db.migrate(old_database, "nobody")
+
+
+def test_migrate_empty_database_without_the_owner(make_database):
+    """
+    Without campaigns to give away, the owner doesn't have to exist.
+    """
+    engine = make_database(UNVERSIONED_SCHEMA[:-1])  # no campaigns, no users
+    migrate_db.migrate(engine, "admin")
+
+    with engine.connect() as conn:
+        assert "owner_id" in migrate_db.columns(conn, "campaigns")
@@ -0,0 +1,85 @@
+import gc
+import tracemalloc
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.readmodels import CampaignRow
+
+# test_db fixture is provided by conftest.py
+
+ROWS = 2000
+
+
+def _fill(db: Session):
+    db.add_all(
+        models.Campaign(
+            owner_id=1, name=f"Campaign {i}", description="Memory test", start_date=date(2025, 1, 1),
+            end_date=date(2025, 1, 31), budget=100.0, status=True, updated_version=i + 1,
+        )
+        for i in range(ROWS)
+    )
+    db.commit()
+    db.expunge_all()
+
+
+def _bytes_per_row(load) -> float:
+    """
+    Memory still allocated per row while the loaded rows are alive.
+    """
+    load()  # warm up statement caches outside the measurement
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        rows = load()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert len(rows) == ROWS
+    return allocated / ROWS
+
+
+def test_list_rows_are_compact(test_db: Session):
+    """
+    List queries return __slots__ rows that take a fraction of the memory of ORM objects.
+    """
+    _fill(test_db)
+
+    row_bytes = _bytes_per_row(lambda: crud.get_campaigns(test_db, owner_id=1, limit=ROWS))
+    orm_bytes = _bytes_per_row(lambda: test_db.query(models.Campaign).limit(ROWS).all())
+    test_db.expunge_all()
+
+    assert row_bytes < 400
+    assert row_bytes * 3 < orm_bytes
+
+
+def test_list_rows_stay_out_of_the_session(test_db: Session):
+    """
+    Rows are plain objects: nothing is added to the identity map, and they
+    serialize exactly like the ORM objects did.
+    """
+    _fill(test_db)
+
+    rows = crud.get_campaigns(test_db, owner_id=1, limit=5)
+
+    assert all(type(row) is CampaignRow for row in rows)
+    assert not hasattr(rows[0], "__dict__")
+    assert len(test_db.identity_map) == 0
+    orm = test_db.get(models.Campaign, rows[0].id)
+    assert schemas.Campaign.model_validate(rows[0]) == schemas.Campaign.model_validate(orm)
+
+
+def test_changed_rows_stay_out_of_the_session(test_db: Session):
+    """
+    Delta sync returns the same plain rows as the list endpoints.
+    """
+    _fill(test_db)
+
+    changed, deleted, _, has_more = crud.get_campaign_changes(test_db, owner_id=1, since=ROWS - 3, limit=2)
+
+    assert [row.id for row in changed] == [ROWS - 2, ROWS - 1]
+    assert all(type(row) is CampaignRow for row in changed)
+    assert (deleted, has_more) == ([], True)
+    assert len(test_db.identity_map) == 0
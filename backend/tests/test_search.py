@@ -0,0 +1,64 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import crud
+
+# client, test_db, auth_headers and create_campaign fixtures are provided by conftest.py
+
+
+def test_build_search_query_quotes_prefix_terms():
+    """
+    User input is reduced to quoted prefix terms, so FTS5 syntax can't be injected.
+    """
+    assert crud.build_search_query('summ "sale" OR') == '"summ"* "sale"* "OR"*'
+    assert crud.build_search_query('  "*() ') == ""
+
+
+def test_search_campaigns_prefix_and_ranking(client: TestClient, auth_headers: dict, create_campaign):
+    """
+    Prefix queries match name and description; name matches rank first.
+    """
+    in_description = create_campaign("Generic Push", description="Our summer clearance")
+    in_name = create_campaign("Summer Sale", description="Discounts")
+    create_campaign("Winter Sale", description="Cold deals")
+
+    response = client.get("/campaigns/search", params={"q": "summ"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == [in_name, in_description]
+
+
+def test_search_index_follows_updates_and_deletes(client: TestClient, auth_headers: dict, create_campaign):
+    """
+    The triggers keep the index in sync with every write.
+    """
+    campaign_id = create_campaign("Spring Launch")
+    client.put(f"/campaigns/{campaign_id}", headers=auth_headers, json={"name": "Autumn Launch"})
+
+    assert client.get("/campaigns/search", params={"q": "spring"}, headers=auth_headers).json() == []
+    assert len(client.get("/campaigns/search", params={"q": "autumn"}, headers=auth_headers).json()) == 1
+
+    client.delete(f"/campaigns/{campaign_id}", headers=auth_headers)
+    assert client.get("/campaigns/search", params={"q": "autumn"}, headers=auth_headers).json() == []
+
+
+def test_rebuild_search_index(client: TestClient, auth_headers: dict, test_db: Session, create_campaign):
+    """
+    Rebuilding recreates a dropped index from the campaigns table.
+    """
+    create_campaign("Holiday Retargeting")
+    test_db.execute(text("DROP TABLE campaigns_fts"))
+    test_db.commit()
+
+    crud.rebuild_campaign_search_index(test_db)
+
+    results = client.get("/campaigns/search", params={"q": "retarget"}, headers=auth_headers).json()
+    assert [c["name"] for c in results] == ["Holiday Retargeting"]
+
+
+def test_search_requires_query(client: TestClient, auth_headers: dict):
+    """
+    An empty query is rejected by validation.
+    """
+    response = client.get("/campaigns/search", params={"q": ""}, headers=auth_headers)
+    assert response.status_code == 422
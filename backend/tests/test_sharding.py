@@ -0,0 +1,136 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import rebalance_shards
+from app import crud, schemas
+from app.main import app
+from app.sharding import SHARD_ID_BITS, FileShardRouter, get_shard_router
+
+# client, test_db, test_user, auth_headers and create_campaign fixtures are provided by conftest.py
+
+
+def _login(client: TestClient, test_db: Session, username: str) -> dict:
+    crud.create_user(test_db, schemas.UserCreate(username=username, password="secret"))
+    response = client.post("/auth/token", data={"username": username, "password": "secret"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def shard_router(tmp_path, client: TestClient):
+    router = FileShardRouter(str(tmp_path / "shards"), shard_count=2)
+    app.dependency_overrides[get_shard_router] = lambda: router
+    yield router
+    router.dispose()
+
+
+def test_campaigns_are_scoped_to_their_owner(
+        client: TestClient, auth_headers: dict, test_db: Session, create_campaign
+):
+    """
+    A user never sees nor changes another user's campaigns.
+    """
+    campaign_id = create_campaign("Secret launch")
+    other = _login(client, test_db, "other")
+
+    assert client.get("/campaigns/", headers=other).json() == []
+    assert client.get("/campaigns/search", headers=other, params={"q": "secret"}).json() == []
+    assert client.get("/campaigns/changes", headers=other).json()["changed"] == []
+    assert client.get("/campaigns/", headers=other, params={"ids": str(campaign_id)}).json() == []
+    assert client.get(f"/campaigns/{campaign_id}", headers=other).status_code == 404
+    assert client.put(f"/campaigns/{campaign_id}", headers=other, json={"name": "Mine"}).status_code == 404
+    assert client.patch(f"/campaigns/{campaign_id}/toggle", headers=other).status_code == 404
+    assert client.delete(f"/campaigns/{campaign_id}", headers=other).status_code == 404
+
+    assert client.get(f"/campaigns/{campaign_id}", headers=auth_headers).json()["name"] == "Secret launch"
+
+
+def test_file_shards_route_owners_to_their_own_database(
+        client: TestClient, test_db: Session, test_user, auth_headers: dict, shard_router: FileShardRouter,
+        create_campaign,
+):
+    """
+    Each owner's campaigns go to its shard file, with ids from that shard's block.
+    """
+    other = _login(client, test_db, "other")  # user id 2 -> shard-0; test_user (id 1) -> shard-1
+    first = create_campaign("Shard one")
+    second = create_campaign("Shard zero", headers=other)
+
+    assert first == (2 << SHARD_ID_BITS) + 1
+    assert second == (1 << SHARD_ID_BITS) + 1
+    for shard, expected in (("shard-0", [second]), ("shard-1", [first])):
+        with sqlite3.connect(shard_router.shard_path(shard)) as conn:
+            assert [row[0] for row in conn.execute("SELECT id FROM campaigns")] == expected
+    assert crud.get_campaigns(test_db, owner_id=test_user.id) == []  # nothing in the main database
+
+    assert [c["id"] for c in client.get("/campaigns/", headers=auth_headers).json()] == [first]
+    assert [c["id"] for c in client.get("/campaigns/search", headers=other, params={"q": "zero"}).json()] == [second]
+
+
+def test_move_owner_between_shards(
+        client: TestClient, test_user, auth_headers: dict, shard_router: FileShardRouter, create_campaign
+):
+    """
+    Moving an owner keeps its campaign ids, and a client that synced before
+    the move gets everything moved (campaigns and deletes) on its next delta sync.
+    """
+    kept = [create_campaign(f"Campaign {i}") for i in range(3)]
+    deleted = create_campaign("Gone")
+    assert client.delete(f"/campaigns/{deleted}", headers=auth_headers).status_code == 200
+    since = client.get("/campaigns/changes", headers=auth_headers).json()["version"]  # client fully synced
+
+    assert rebalance_shards.move_owner(shard_router, test_user.id, "shard-0") == 3
+    assert shard_router.shard_for(test_user.id) == "shard-0"
+    assert rebalance_shards.shard_sizes(shard_router) == {"shard-0": {test_user.id: 3}, "shard-1": {}}
+
+    assert [c["id"] for c in client.get("/campaigns/", headers=auth_headers).json()] == kept
+    changes = client.get("/campaigns/changes", headers=auth_headers, params={"since": since}).json()
+    assert sorted(c["id"] for c in changes["changed"]) == kept
+    assert changes["deleted"] == [deleted]
+    assert [c["id"] for c in client.get("/campaigns/search", headers=auth_headers, params={"q": "campaign"}).json()] == kept
+    # New campaigns come from shard-0's id block, so they can never collide with moved ones.
+    assert create_campaign("After the move") == (1 << SHARD_ID_BITS) + 1
+
+
+def test_move_from_main_database_to_shards(
+        client: TestClient, test_db: Session, test_user, auth_headers: dict, shard_router: FileShardRouter
+):
+    """
+    Campaigns created before sharding was enabled (in the main database) keep
+    their ids on the owner's shard and are synced again by the owner's clients.
+    """
+    kept = [
+        crud.create_campaign(test_db, test_user.id, schemas.CampaignCreate(
+            name=f"Before sharding {i}", start_date="2025-01-01", end_date="2025-01-31", budget=1.0,
+        )).id
+        for i in range(2)
+    ]
+    gone = crud.create_campaign(test_db, test_user.id, schemas.CampaignCreate(
+        name="Gone", start_date="2025-01-01", end_date="2025-01-31", budget=1.0,
+    ))
+    deleted = gone.id
+    crud.delete_campaign(test_db, gone)
+    assert client.get("/campaigns/", headers=auth_headers).json() == []  # the shards don't see them yet
+
+    assert rebalance_shards.move_from_main(shard_router, test_db) == {test_user.id: 2}
+
+    assert [c["id"] for c in client.get("/campaigns/", headers=auth_headers).json()] == kept
+    changes = client.get("/campaigns/changes", headers=auth_headers).json()
+    assert ([c["id"] for c in changes["changed"]], changes["deleted"]) == (kept, [deleted])
+    assert crud.get_campaigns(test_db, owner_id=test_user.id) == []
+
+
+def test_plan_rebalance_evens_out_shards():
+    """
+    The planned moves bring the shards within the tolerance of the mean.
+    """
+    sizes = {"shard-0": {1: 500, 2: 300, 3: 200}, "shard-1": {4: 100}, "shard-2": {}}
+    moves = rebalance_shards.plan_rebalance(sizes, tolerance=0.6)
+
+    for owner, source, target in moves:
+        sizes[target][owner] = sizes[source].pop(owner)
+    totals = sorted(sum(owners.values()) for owners in sizes.values())
+    assert totals[-1] - totals[0] <= 0.6 * sum(totals) / len(totals)
+    assert len(moves) == 2
@@ -0,0 +1,59 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, schemas, statements
+
+# test_db and test_user fixtures are provided by conftest.py
+
+
+def test_hot_queries_reuse_compiled_statements(test_db: Session, test_user):
+    """
+    Repeated hot queries reuse one compiled statement (and so one SQL string
+    for sqlite3's prepared statement cache) whatever the parameter values.
+    """
+    crud.create_campaign(test_db, test_user.id, schemas.CampaignCreate(
+        name="Cached", start_date="2025-01-01", end_date="2025-01-31", budget=10.0,
+    ))
+    compiled = []
+    engine = test_db.get_bind()
+    listener = lambda conn, cursor, statement, params, context, many: compiled.append(context.compiled)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        for username in ("testuser", "nobody"):
+            crud.get_user_by_username(test_db, username=username)
+        for campaign_id in (1, 2):
+            crud.get_campaign(test_db, owner_id=test_user.id, campaign_id=campaign_id)
+        for skip, limit in ((0, 10), (5, 50)):
+            crud.get_campaigns(test_db, owner_id=test_user.id, skip=skip, limit=limit)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(compiled) == 6
+    for first, second in zip(compiled[::2], compiled[1::2]):
+        assert first is second
+
+
+def test_hot_queries_results(test_db: Session, test_user):
+    """
+    The prebuilt statements return the same results as the ORM queries they replace.
+    """
+    for i in range(3):
+        crud.create_campaign(test_db, test_user.id, schemas.CampaignCreate(
+            name=f"Campaign {i}", start_date="2025-01-01", end_date="2025-01-31", budget=10.0,
+        ))
+
+    assert crud.get_user_by_username(test_db, username="testuser").id == test_user.id
+    assert crud.get_user_by_username(test_db, username="nobody") is None
+    assert crud.get_campaign(test_db, owner_id=test_user.id, campaign_id=2).name == "Campaign 1"
+    assert [c.id for c in crud.get_campaigns(test_db, owner_id=test_user.id, skip=1, limit=1)] == [2]
+    assert [c.id for c in crud.get_campaigns(test_db, owner_id=test_user.id, ids=[3, 1])] == [1, 3]
+
+
+def test_campaign_pages_are_ordered_by_id_without_sorting(test_db: Session):
+    """
+    Pages have a stable order, served from the owner_id index (no temporary sort).
+    """
+    sql = str(statements.CAMPAIGNS_PAGE.compile(test_db.get_bind()))
+    assert "ORDER BY campaigns.id" in sql
+    plan = test_db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", (1, 10, 0)).all()
+    assert not any("TEMP B-TREE" in row[-1] for row in plan)
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import crud
+
+# client, test_db, auth_headers and create_campaign fixtures are provided by conftest.py
+
+
+def _changes(client: TestClient, auth_headers: dict, **params):
+    response = client.get("/campaigns/changes", params=params, headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_changes_full_sync_then_delta(client: TestClient, auth_headers: dict, create_campaign):
+    """
+    A sync from 0 returns everything; the next one only what changed since.
+    """
+    first = create_campaign("First")
+    second = create_campaign("Second")
+
+    full = _changes(client, auth_headers, since=0)
+    assert [c["id"] for c in full["changed"]] == [first, second]
+    assert full["deleted"] == []
+    assert full["has_more"] is False
+
+    client.patch(f"/campaigns/{second}/toggle", headers=auth_headers)
+    client.delete(f"/campaigns/{first}", headers=auth_headers)
+
+    delta = _changes(client, auth_headers, since=full["version"])
+    assert [c["id"] for c in delta["changed"]] == [second]
+    assert delta["changed"][0]["status"] is False
+    assert delta["deleted"] == [first]
+    assert delta["version"] > full["version"]
+
+    assert _changes(client, auth_headers, since=delta["version"])["changed"] == []
+
+
+def test_changes_pagination(client: TestClient, auth_headers: dict, create_campaign):
+    """
+    Pages are cut by version and chain through 'version' until has_more is false.
+    """
+    ids = [create_campaign(f"Campaign {i}") for i in range(5)]
+    client.delete(f"/campaigns/{ids[1]}", headers=auth_headers)
+
+    seen, deleted, since = [], [], 0
+    while True:
+        page = _changes(client, auth_headers, since=since, limit=2)
+        seen += [c["id"] for c in page["changed"]]
+        deleted += page["deleted"]
+        since = page["version"]
+        if not page["has_more"]:
+            break
+
+    assert seen == [ids[0]] + ids[2:]
+    assert deleted == [ids[1]]
+
+
+def test_compaction_forces_resync(
+        client: TestClient, auth_headers: dict, test_db: Session, create_campaign
+):
+    """
+    After tombstones are compacted, older versions get 410 Gone.
+    """
+    campaign_id = create_campaign("Old")
+    stale = _changes(client, auth_headers, since=0)["version"]
+    client.delete(f"/campaigns/{campaign_id}", headers=auth_headers)
+
+    assert crud.compact_campaign_tombstones(test_db, older_than=timedelta(0)) == 1
+
+    response = client.get("/campaigns/changes", params={"since": stale}, headers=auth_headers)
+    assert response.status_code == 410
+    assert _changes(client, auth_headers, since=0)["deleted"] == []
+
+
+def test_deleted_ids_are_not_reused(client: TestClient, auth_headers: dict, create_campaign):
+    """
+    A new campaign never takes the id of a deleted one (its tombstone would lie).
+    """
+    campaign_id = create_campaign("Gone")
+    client.delete(f"/campaigns/{campaign_id}", headers=auth_headers)
+    assert create_campaign("New") != campaign_id
+
+
+def test_changes_rejects_out_of_range_versions(client: TestClient, auth_headers: dict):
+    """
+    A 'since' beyond SQLite's integer range is a client error, not a server one.
+    """
+    for since in (-1, 2**63):
+        response = client.get("/campaigns/changes", params={"since": since}, headers=auth_headers)
+        assert response.status_code == 422
+    assert _changes(client, auth_headers, since=2**63 - 1)["changed"] == []